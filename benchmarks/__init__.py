@@ -0,0 +1,5 @@
+"""Reproducible performance benchmarks for the ingestion pipeline.
+
+``python -m benchmarks.run`` times the core stages on a synthetic corpus and
+emits JSON results that can be compared across releases.
+"""
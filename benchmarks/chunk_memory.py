@@ -0,0 +1,85 @@
+"""Memory held by a local chunk cache, with and without shared strings/ACLs.
+
+Loads a JSONL chunk export (as written by ``JSONLIndexer``) into ``Chunk``
+objects and into an un-interned copy of the previous ``Chunk`` layout, and
+reports the bytes retained by each. Every JSONL line decodes to fresh
+``doc_id``/``rev``/``source_url`` strings and a new ``allowed_groups`` list,
+which is the duplication interning removes.
+
+    python -m benchmarks.chunk_memory --preset medium
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from dataclasses import dataclass, field, fields
+from typing import Callable, List, Optional
+
+from agentic_rag.chunking import ChunkingConfig, chunk_document
+from agentic_rag.models import Chunk
+
+from .corpus import PRESETS, CorpusSpec, iter_revisions
+
+
+@dataclass(slots=True)
+class _LegacyChunk:
+    """``Chunk`` before interning, kept as the "before" reference."""
+
+    chunk_id: str
+    doc_id: str
+    rev: str
+    text: str
+    page_start: int
+    page_end: int
+    section_path: Optional[str]
+    token_count: int
+    allowed_groups: List[str]
+    source_url: str
+    metadata: dict = field(default_factory=dict)
+
+
+_FIELDS = [f.name for f in fields(Chunk)]
+
+
+def export_lines(spec: CorpusSpec) -> List[str]:
+    config = ChunkingConfig()
+    lines: List[str] = []
+    for revision in iter_revisions(spec):
+        for chunk in chunk_document(revision, config):
+            lines.append(json.dumps({name: getattr(chunk, name) for name in _FIELDS}))
+    return lines
+
+
+def retained_bytes(lines: List[str], factory: Callable[..., object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    loaded = [factory(**json.loads(line)) for line in lines]
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del loaded
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure chunk-cache memory with interning")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    args = parser.parse_args()
+
+    lines = export_lines(PRESETS[args.preset])
+    legacy = retained_bytes(lines, _LegacyChunk)
+    current = retained_bytes(lines, Chunk)
+    text_bytes = sum(sys.getsizeof(json.loads(line)["text"]) for line in lines)
+    legacy_other = legacy - text_bytes
+    current_other = current - text_bytes
+    print(f"chunks loaded:     {len(lines):,}")
+    print(f"legacy Chunk:      {legacy / 2**20:8.2f} MiB, {legacy_other / len(lines):6,.0f} B/chunk besides text")
+    print(f"interned Chunk:    {current / 2**20:8.2f} MiB, {current_other / len(lines):6,.0f} B/chunk besides text")
+    print(f"saved:             {(legacy - current) / 2**20:8.2f} MiB ({1 - current_other / legacy_other:.1%} of non-text)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Chunking throughput benchmark: legacy rescanning chunker vs prefix-sum buffer.
+
+Run from the repository root after ``pip install -e .``::
+
+    python -m benchmarks.chunking_throughput --blocks 20000 --overlap-tokens 200
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable, List, Sequence
+
+from agentic_rag.chunking import ChunkingConfig, chunk_document
+from agentic_rag.models import Chunk, DocumentBlock, DocumentRevision
+from agentic_rag.tokenization import estimate_tokens as _estimate_tokens
+
+_WORDS = (
+    "torque shall nominal widget assembly fastener heat treat material vibration "
+    "dwell inspection tolerance revision fixture coating thread washer bracket"
+).split()
+
+
+def _legacy_chunk_document(doc: DocumentRevision, config: ChunkingConfig) -> List[Chunk]:
+    """Pre-prefix-sum chunker, kept verbatim as the "before" reference."""
+
+    chunks: List[Chunk] = []
+    buffer: List[DocumentBlock] = []
+    buffer_tokens = 0
+    chunk_index = 0
+
+    def tail_within_tokens(blocks: Sequence[DocumentBlock], max_tokens: int) -> List[DocumentBlock]:
+        tail: List[DocumentBlock] = []
+        total = 0
+        for block in reversed(blocks):
+            tokens = _estimate_tokens(block.text)
+            if total + tokens > max_tokens and tail:
+                break
+            tail.append(block)
+            total += tokens
+        return list(reversed(tail))
+
+    def build_section_path(blocks: Sequence[DocumentBlock]) -> str | None:
+        headings = [block.text.strip() for block in blocks if block.kind == "heading"]
+        if not headings:
+            return None
+        return " > ".join(dict.fromkeys(headings))
+
+    def flush(force: bool = False) -> None:
+        nonlocal buffer, buffer_tokens, chunk_index
+        if not buffer:
+            return
+        if not force and buffer_tokens < config.target_tokens:
+            return
+        text = "\n".join(block.text for block in buffer)
+        chunks.append(
+            Chunk(
+                chunk_id=f"{doc.doc_id}:{doc.rev}:{chunk_index:04d}",
+                doc_id=doc.doc_id,
+                rev=doc.rev,
+                text=text,
+                page_start=min(block.page for block in buffer),
+                page_end=max(block.page for block in buffer),
+                section_path=build_section_path(buffer),
+                token_count=_estimate_tokens(text),
+                allowed_groups=doc.allowed_groups,
+                source_url=doc.source_url,
+                metadata={"chunk_index": chunk_index, "title": doc.title},
+            )
+        )
+        chunk_index += 1
+        buffer = tail_within_tokens(buffer, config.overlap_tokens)
+        buffer_tokens = sum(_estimate_tokens(block.text) for block in buffer)
+
+    for block in doc.blocks:
+        buffer.append(block)
+        buffer_tokens += _estimate_tokens(block.text)
+        if buffer_tokens >= config.target_tokens:
+            flush()
+        if buffer_tokens >= config.max_tokens:
+            flush(force=True)
+
+    flush(force=True)
+    return chunks
+
+
+def build_document(num_blocks: int, max_words: int, seed: int) -> DocumentRevision:
+    rng = random.Random(seed)
+    blocks = []
+    for i in range(num_blocks):
+        if rng.random() < 0.1:
+            blocks.append(DocumentBlock(page=i // 40 + 1, kind="heading", text=f"Section {i}"))
+            continue
+        words = rng.randint(1, max_words)
+        text = " ".join(rng.choice(_WORDS) for _ in range(words))
+        blocks.append(DocumentBlock(page=i // 40 + 1, kind="para", text=text))
+    return DocumentRevision(
+        doc_id="BENCH-0001",
+        rev="A",
+        title="Synthetic benchmark document",
+        effective_date=None,
+        allowed_groups=["bench"],
+        source_url="bench://synthetic",
+        blocks=blocks,
+    )
+
+
+def _measure(fn: Callable[[], List[Chunk]], repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    produced = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        produced = len(fn())
+        best = min(best, time.perf_counter() - started)
+    return best, produced
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=20_000)
+    parser.add_argument("--max-words", type=int, default=30, help="Upper bound on words per block")
+    parser.add_argument("--target-tokens", type=int, default=500)
+    parser.add_argument("--overlap-tokens", type=int, default=200)
+    parser.add_argument("--max-tokens", type=int, default=800)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    doc = build_document(args.blocks, args.max_words, args.seed)
+    config = ChunkingConfig(
+        target_tokens=args.target_tokens,
+        overlap_tokens=args.overlap_tokens,
+        max_tokens=args.max_tokens,
+    )
+    legacy_seconds, legacy_chunks = _measure(lambda: _legacy_chunk_document(doc, config), args.repeat)
+    current_seconds, current_chunks = _measure(lambda: chunk_document(doc, config), args.repeat)
+
+    # Counts can differ: the current chunker splits blocks larger than max_tokens.
+    print(f"blocks={args.blocks} overlap_tokens={args.overlap_tokens}")
+    for label, seconds, chunks in (
+        ("before", legacy_seconds, legacy_chunks),
+        ("after", current_seconds, current_chunks),
+    ):
+        print(f"{label:>6}: {args.blocks / seconds:12,.0f} blocks/sec ({seconds * 1000:8.1f} ms, {chunks} chunks)")
+    print(f"speedup: {legacy_seconds / current_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Synthetic normalized-document corpora for reproducible benchmarks.
+
+Documents look like exported engineering specs: numbered headings, prose
+paragraphs, pipe tables, and a running header/footer/legend on every page.
+Each document gets several revisions that differ by a handful of edited,
+inserted or deleted blocks, which is what re-ingest paths see in practice.
+
+Write a corpus to disk (one JSON file per revision)::
+
+    python -m benchmarks.corpus --out-dir /tmp/corpus --documents 200 --revisions 3
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from agentic_rag.models import DocumentBlock, DocumentRevision
+
+_VOCABULARY = (
+    "torque shall nominal widget assembly fastener heat treat material vibration dwell "
+    "inspection tolerance revision fixture coating thread washer bracket housing seal "
+    "gasket surface finish hardness tensile yield fatigue cycle load bearing shaft "
+    "clearance interference alignment calibration procedure acceptance criteria sample "
+    "lot traceability supplier deviation waiver drawing datum flatness runout"
+).split()
+_GROUPS = ["ME-Design", "QA-Compliance", "Manufacturing", "Supplier-Quality", "Field-Service"]
+
+
+@dataclass(slots=True)
+class CorpusSpec:
+    """Shape of a synthetic corpus; identical specs produce identical corpora."""
+
+    documents: int = 20
+    revisions: int = 3
+    pages: int = 40
+    blocks_per_page: int = 12
+    table_probability: float = 0.08
+    edits_per_revision: int = 6
+    seed: int = 1234
+
+
+PRESETS: Dict[str, CorpusSpec] = {
+    "small": CorpusSpec(documents=10, revisions=2, pages=10),
+    "medium": CorpusSpec(documents=50, revisions=3, pages=40),
+    "large": CorpusSpec(documents=200, revisions=4, pages=120),
+}
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(_VOCABULARY) for _ in range(rng.randint(6, 22))]
+    words[0] = words[0].capitalize()
+    return " ".join(words) + rng.choice([".", ".", ".", ";", "."])
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(_sentence(rng) for _ in range(rng.randint(1, 6)))
+
+
+def _table(rng: random.Random) -> str:
+    columns = rng.randint(3, 6)
+    header = "| " + " | ".join(rng.choice(_VOCABULARY).title() for _ in range(columns)) + " |"
+    rows = [
+        "| " + " | ".join(f"{rng.uniform(0, 500):.2f}" for _ in range(columns)) + " |"
+        for _ in range(rng.randint(3, 15))
+    ]
+    return "\n".join([header, "|" + "---|" * columns, *rows])
+
+
+def _base_blocks(rng: random.Random, spec: CorpusSpec, doc_id: str, title: str) -> List[DocumentBlock]:
+    blocks: List[DocumentBlock] = []
+    section = 0
+    subsection = 0
+    for page in range(1, spec.pages + 1):
+        blocks.append(DocumentBlock(page=page, kind="para", text=f"{doc_id} {title} - COMPANY PROPRIETARY"))
+        for _ in range(spec.blocks_per_page):
+            roll = rng.random()
+            if roll < 0.04 or section == 0:
+                section += 1
+                subsection = 0
+                text = f"{section} {rng.choice(_VOCABULARY).title()} {rng.choice(_VOCABULARY).title()}"
+                blocks.append(DocumentBlock(page=page, kind="heading", text=text))
+            elif roll < 0.10:
+                subsection += 1
+                text = f"{section}.{subsection} {rng.choice(_VOCABULARY).title()}"
+                blocks.append(DocumentBlock(page=page, kind="heading", text=text))
+            elif roll < 0.10 + spec.table_probability:
+                blocks.append(DocumentBlock(page=page, kind="table", text=_table(rng)))
+            else:
+                blocks.append(DocumentBlock(page=page, kind="para", text=_paragraph(rng)))
+        blocks.append(
+            DocumentBlock(
+                page=page,
+                kind="para",
+                text="EXPORT CONTROLLED: this document contains technical data subject to the EAR.",
+            )
+        )
+        blocks.append(DocumentBlock(page=page, kind="para", text=f"Page {page} of {spec.pages}"))
+    return blocks
+
+
+def _revise(rng: random.Random, blocks: List[DocumentBlock], edits: int) -> List[DocumentBlock]:
+    revised = list(blocks)
+    for _ in range(edits):
+        position = rng.randrange(len(revised))
+        page = revised[position].page
+        action = rng.random()
+        if action < 0.6:
+            revised[position] = DocumentBlock(page=page, kind="para", text=_paragraph(rng))
+        elif action < 0.8:
+            revised.insert(position, DocumentBlock(page=page, kind="para", text=_paragraph(rng)))
+        elif len(revised) > 1:
+            del revised[position]
+    return revised
+
+
+def iter_revisions(spec: CorpusSpec) -> Iterator[DocumentRevision]:
+    """Yield every revision of every document, oldest revision first."""
+
+    rng = random.Random(spec.seed)
+    for number in range(spec.documents):
+        doc_id = f"SPEC-{number + 1000:05d}"
+        title = f"{rng.choice(_VOCABULARY).title()} {rng.choice(_VOCABULARY).title()} Specification"
+        groups = sorted(rng.sample(_GROUPS, rng.randint(1, 3)))
+        blocks = _base_blocks(rng, spec, doc_id, title)
+        for revision in range(spec.revisions):
+            rev = chr(ord("A") + revision)
+            if revision:
+                blocks = _revise(rng, blocks, spec.edits_per_revision)
+            yield DocumentRevision(
+                doc_id=doc_id,
+                rev=rev,
+                title=title,
+                effective_date=f"2025-{revision % 12 + 1:02d}-15",
+                allowed_groups=groups,
+                source_url=f"sharepoint://specs/{doc_id} Rev {rev}.pdf",
+                blocks=blocks,
+                owner="bench",
+            )
+
+
+def revision_to_json(revision: DocumentRevision) -> str:
+    payload = {
+        "doc_id": revision.doc_id,
+        "rev": revision.rev,
+        "title": revision.title,
+        "effective_date": revision.effective_date,
+        "allowed_groups": revision.allowed_groups,
+        "source_url": revision.source_url,
+        "owner": revision.owner,
+        "blocks": [asdict(block) for block in revision.blocks],
+    }
+    return json.dumps(payload)
+
+
+def write_corpus(spec: CorpusSpec, out_dir: Path) -> List[Path]:
+    """Write one normalized JSON file per revision and return their paths."""
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths: List[Path] = []
+    for revision in iter_revisions(spec):
+        path = out_dir / f"{revision.doc_id}_{revision.rev}.json"
+        path.write_text(revision_to_json(revision), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic normalized-document corpus")
+    parser.add_argument("--out-dir", type=Path, required=True)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--documents", type=int)
+    parser.add_argument("--revisions", type=int)
+    parser.add_argument("--pages", type=int)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    spec = PRESETS[args.preset]
+    overrides = {
+        name: getattr(args, name)
+        for name in ("documents", "revisions", "pages", "seed")
+        if getattr(args, name) is not None
+    }
+    spec = CorpusSpec(**{**asdict(spec), **overrides})
+    paths = write_corpus(spec, args.out_dir)
+    print(f"Wrote {len(paths)} revisions to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Run the ingestion benchmark suite and emit machine-readable results.
+
+    python -m benchmarks.run --preset medium --output bench/results.json
+
+Every benchmark runs ``--repeat`` times over the same seeded corpus. The JSON
+document records the environment, the corpus spec, and for each benchmark the
+item count, min/median/mean seconds and items per second (from the median).
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from agentic_rag.chunking import ChunkingConfig, chunk_document
+from agentic_rag.embeddings import EmbeddingCallStats, MockEmbeddingProvider, _store_response
+from agentic_rag.indexing import JSONLIndexer
+from agentic_rag.loading import load_revision, stream_revision
+from agentic_rag.models import Chunk, DocumentRevision, EmbeddedChunk
+
+from .corpus import PRESETS, CorpusSpec, iter_revisions, write_corpus
+
+SCHEMA_VERSION = 1
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    name: str
+    items: int
+    unit: str
+    seconds_min: float
+    seconds_median: float
+    seconds_mean: float
+
+    @property
+    def per_second(self) -> float:
+        return self.items / self.seconds_median if self.seconds_median else 0.0
+
+    def to_dict(self) -> Dict[str, object]:
+        payload = asdict(self)
+        payload["per_second"] = self.per_second
+        return payload
+
+
+def _time(name: str, unit: str, items: int, fn: Callable[[], object], repeat: int) -> BenchmarkResult:
+    samples: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return BenchmarkResult(
+        name=name,
+        items=items,
+        unit=unit,
+        seconds_min=min(samples),
+        seconds_median=statistics.median(samples),
+        seconds_mean=statistics.fmean(samples),
+    )
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def _embedding_responses(vectors) -> Dict[str, bytes]:
+    """The same ``/v1/embeddings`` response body in each ``encoding_format``."""
+
+    encoders = {
+        "float": lambda vector: vector.tolist(),
+        "base64": lambda vector: base64.b64encode(vector.astype("<f4").tobytes()).decode("ascii"),
+    }
+    return {
+        name: json.dumps(
+            {"data": [{"index": index, "embedding": encode(vector)} for index, vector in enumerate(vectors)]}
+        ).encode("utf-8")
+        for name, encode in encoders.items()
+    }
+
+
+def _decode_response(body: bytes, count: int) -> None:
+    # What the provider does per response: parse the JSON, then fill the matrix.
+    _store_response(None, range(count), json.loads(body), count, EmbeddingCallStats())
+
+
+def run_suite(spec: CorpusSpec, *, repeat: int = 3, embed_limit: int = 2000) -> Dict[str, object]:
+    revisions = list(iter_revisions(spec))
+    block_count = sum(len(revision.blocks) for revision in revisions)
+    config = ChunkingConfig()
+    results: List[BenchmarkResult] = []
+
+    results.append(
+        _time(
+            "chunk_document",
+            "blocks",
+            block_count,
+            lambda: [chunk_document(revision, config) for revision in revisions],
+            repeat,
+        )
+    )
+    chunks: List[Chunk] = [chunk for revision in revisions for chunk in chunk_document(revision, config)]
+
+    with tempfile.TemporaryDirectory(prefix="agentic-rag-bench-") as workdir:
+        paths = write_corpus(spec, Path(workdir) / "corpus")
+        results.append(
+            _time(
+                "DocumentRevision.from_json",
+                "files",
+                len(paths),
+                lambda: [DocumentRevision.from_json(path) for path in paths],
+                repeat,
+            )
+        )
+        results.append(
+            _time(
+                "load_revision",
+                "files",
+                len(paths),
+                lambda: [load_revision(path) for path in paths],
+                repeat,
+            )
+        )
+        results.append(
+            _time(
+                "stream_revision",
+                "blocks",
+                block_count,
+                lambda: [sum(1 for _ in stream_revision(path)[1]) for path in paths],
+                repeat,
+            )
+        )
+
+        texts = [chunk.text for chunk in chunks[:embed_limit]]
+        provider = MockEmbeddingProvider()
+        results.append(
+            _time("MockEmbeddingProvider.embed", "texts", len(texts), lambda: provider.embed(texts), repeat)
+        )
+
+        vectors = provider.embed(texts)
+        for encoding_format, body in _embedding_responses(vectors).items():
+            results.append(
+                _time(
+                    f"decode embeddings ({encoding_format})",
+                    "vectors",
+                    len(vectors),
+                    lambda body=body: _decode_response(body, len(vectors)),
+                    repeat,
+                )
+            )
+        embedded = [
+            EmbeddedChunk.from_chunk(chunk, vector, "mock")
+            for chunk, vector in zip(chunks, vectors)
+        ]
+        output_path = Path(workdir) / "chunks.jsonl"
+
+        def upload() -> None:
+            output_path.unlink(missing_ok=True)
+            JSONLIndexer(output_path).upload(embedded)
+
+        results.append(_time("JSONLIndexer.upload", "chunks", len(embedded), upload, repeat))
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "corpus": {**asdict(spec), "revision_count": len(revisions), "block_count": block_count},
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the agentic-rag ingestion benchmarks")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--documents", type=int, help="Override the preset's document count")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--embed-limit", type=int, default=2000, help="Max texts for the embedder benchmark")
+    parser.add_argument("--output", type=Path, help="Write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    spec = PRESETS[args.preset]
+    if args.documents is not None:
+        spec = CorpusSpec(**{**asdict(spec), "documents": args.documents})
+    report = run_suite(spec, repeat=args.repeat, embed_limit=args.embed_limit)
+
+    for result in report["results"]:
+        print(
+            f"{result['name']:<30} {result['per_second']:>14,.0f} {result['unit']}/s "
+            f"(median {result['seconds_median'] * 1000:.1f} ms over {result['items']} {result['unit']})",
+            file=sys.stderr,
+        )
+    document = json.dumps(report, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(document + "\n", encoding="utf-8")
+    else:
+        print(document)
+
+
+if __name__ == "__main__":
+    main()
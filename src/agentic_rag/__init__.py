@@ -1,14 +1,37 @@
 """Agentic RAG reference implementation components."""
 
-from . import chunking, config, embeddings, grounding, indexing, models, retrieval, reranking
+from . import (
+    boilerplate,
+    chunking,
+    config,
+    embedding_cache,
+    embeddings,
+    grounding,
+    http_client,
+    indexing,
+    ingestion,
+    loading,
+    models,
+    ratelimit,
+    retrieval,
+    reranking,
+    tokenization,
+)
 
 __all__ = [
+    "boilerplate",
     "chunking",
     "config",
+    "embedding_cache",
     "embeddings",
     "grounding",
+    "http_client",
     "indexing",
+    "ingestion",
+    "loading",
     "models",
+    "ratelimit",
     "retrieval",
     "reranking",
+    "tokenization",
 ]
@@ -0,0 +1,109 @@
+"""Repeated header/footer/legend removal ahead of chunking."""
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .models import DocumentBlock
+from .tokenization import HeuristicTokenizer, Tokenizer
+
+_WHITESPACE = re.compile(r"\s+")
+_PAGE_NUMBER = re.compile(
+    r"\b(?:page|pg\.?)\s*\d+(?:\s*(?:of|/)\s*\d+)?\b"
+    r"|^[\W_]*\d+(?:\s*(?:of|/)\s*\d+)?[\W_]*$"
+)
+
+
+def _boilerplate_key(text: str) -> bytes:
+    """Hash of the text with case, spacing and page numbers normalized.
+
+    Only page-number patterns are folded, so "Page 3 of 40" and "Page 4 of 40"
+    count as the same footer while numbered steps and table rows that differ
+    only by their numbers stay distinct.
+    """
+
+    normalized = _PAGE_NUMBER.sub("#", _WHITESPACE.sub(" ", text).strip().lower())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest()
+
+
+@dataclass(slots=True)
+class BoilerplateReport:
+    """What a strip pass removed from one document."""
+
+    blocks_removed: int = 0
+    tokens_removed: int = 0
+    distinct_texts: int = 0
+
+
+class BoilerplateFilter:
+    """Drops block texts repeated across the pages of a document.
+
+    A text counts as boilerplate when it appears on at least ``min_pages``
+    pages and on at least ``page_fraction`` of the document's pages. With
+    ``collapse`` the first occurrence is kept and only repeats are removed.
+    Documents passed to ``observe`` also build corpus-wide counts; a text seen
+    in ``corpus_min_documents`` or more documents is removed as well.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_pages: int = 3,
+        page_fraction: float = 0.5,
+        collapse: bool = False,
+        corpus_min_documents: Optional[int] = None,
+        tokenizer: Optional[Tokenizer] = None,
+    ) -> None:
+        self.min_pages = min_pages
+        self.page_fraction = page_fraction
+        self.collapse = collapse
+        self.corpus_min_documents = corpus_min_documents
+        self.tokenizer = tokenizer or HeuristicTokenizer()
+        self.corpus_counts: Counter[bytes] = Counter()
+        self.corpus_documents = 0
+
+    def observe(self, blocks: Iterable[DocumentBlock]) -> None:
+        """Add one document's distinct block texts to the corpus counts."""
+
+        self.corpus_counts.update({_boilerplate_key(block.text) for block in blocks if block.text})
+        self.corpus_documents += 1
+
+    def strip(self, blocks: Sequence[DocumentBlock]) -> Tuple[List[DocumentBlock], BoilerplateReport]:
+        keys = [_boilerplate_key(block.text) if block.text else b"" for block in blocks]
+        repeated = self._repeated_keys(blocks, keys)
+        report = BoilerplateReport(distinct_texts=len(repeated))
+        if not repeated:
+            return list(blocks), report
+
+        kept: List[DocumentBlock] = []
+        seen: Set[bytes] = set()
+        for block, key in zip(blocks, keys):
+            if key in repeated and not (self.collapse and key not in seen):
+                report.blocks_removed += 1
+                report.tokens_removed += self.tokenizer.count_tokens(block.text)
+                continue
+            seen.add(key)
+            kept.append(block)
+        return kept, report
+
+    def _repeated_keys(self, blocks: Sequence[DocumentBlock], keys: Sequence[bytes]) -> Set[bytes]:
+        pages_by_key: Dict[bytes, Set[int]] = {}
+        for block, key in zip(blocks, keys):
+            if key:
+                pages_by_key.setdefault(key, set()).add(block.page)
+        page_count = len({block.page for block in blocks})
+        threshold = max(self.min_pages, self.page_fraction * page_count)
+        repeated = {key for key, pages in pages_by_key.items() if len(pages) >= threshold}
+        if self.corpus_min_documents:
+            repeated.update(
+                key
+                for key in pages_by_key
+                if self.corpus_counts[key] >= self.corpus_min_documents
+            )
+        return repeated
+
+
+__all__ = ["BoilerplateFilter", "BoilerplateReport"]
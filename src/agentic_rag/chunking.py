@@ -2,17 +2,19 @@
 from __future__ import annotations
 
 import itertools
-from dataclasses import dataclass
-from typing import Iterable, List, Sequence
-
-from .models import Chunk, DocumentRevision, DocumentBlock
+import re
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
 
-def _estimate_tokens(text: str) -> int:
-    """Rough token estimator (word count * 1.3)."""
+from .embeddings import EmbeddingProvider
+from .models import Chunk, DocumentRevision, DocumentBlock
+from .tokenization import HeuristicTokenizer, Tokenizer
 
-    words = len(text.split())
-    return max(1, int(words * 1.3))
+CHUNKING_MODES = ("fixed", "semantic")
 
 
 @dataclass(slots=True)
@@ -20,74 +22,374 @@ class ChunkingConfig:
     target_tokens: int = 500
     overlap_tokens: int = 75
     max_tokens: int = 800
+    tokenizer: Tokenizer = field(default_factory=HeuristicTokenizer)
+    # "fixed" packs blocks to target_tokens with overlap; "semantic" cuts at
+    # topic shifts between min_tokens and max_tokens, without overlap.
+    mode: str = "fixed"
+    min_tokens: int = 150
+    breakpoint_percentile: float = 90.0
 
 
-def chunk_document(doc: DocumentRevision, config: ChunkingConfig | None = None) -> List[Chunk]:
+def chunk_document(
+    doc: DocumentRevision,
+    config: ChunkingConfig | None = None,
+    embedder: EmbeddingProvider | None = None,
+) -> List[Chunk]:
     """Chunk a normalized document into overlapping passages."""
 
+    return list(iter_chunks(doc.blocks, config, doc=doc, embedder=embedder))
+
+
+def iter_chunks(
+    blocks: Iterable[DocumentBlock],
+    config: ChunkingConfig | None = None,
+    *,
+    doc: DocumentRevision,
+    embedder: EmbeddingProvider | None = None,
+) -> Iterator[Chunk]:
+    """Yield chunks as they close from any block iterator.
+
+    ``doc`` supplies the revision-level fields (ids, ACLs, source URL); its own
+    ``blocks`` list is ignored so callers can pass a header-only revision and
+    stream blocks from disk. Only the open buffer plus the overlap tail is held
+    in memory, so usage is bounded by ``max_tokens`` rather than document size.
+    Semantic mode needs every block up front and an ``embedder``.
+    """
+
     config = config or ChunkingConfig()
-    chunks: List[Chunk] = []
-    buffer: List[DocumentBlock] = []
-    buffer_tokens = 0
+    if config.mode == "semantic":
+        if embedder is None:
+            raise ValueError("Semantic chunking requires an embedding provider")
+        yield from _iter_semantic_chunks(list(blocks), config, doc, embedder)
+        return
+    if config.mode != "fixed":
+        raise ValueError(f"Unknown chunking mode {config.mode!r}; expected one of {CHUNKING_MODES}")
+    count_tokens = config.tokenizer.count_tokens
+    headings = _HeadingStack()
+    buffer = _ChunkBuffer()
     chunk_index = 0
 
-    def flush(force: bool = False) -> None:
-        nonlocal buffer, buffer_tokens, chunk_index
-        if not buffer:
-            return
-        if not force and buffer_tokens < config.target_tokens:
-            return
-        text = "\n".join(block.text for block in buffer)
-        token_count = _estimate_tokens(text)
-        chunk_id = f"{doc.doc_id}:{doc.rev}:{chunk_index:04d}"
-        chunk = Chunk(
-            chunk_id=chunk_id,
-            doc_id=doc.doc_id,
-            rev=doc.rev,
-            text=text,
-            page_start=min(block.page for block in buffer),
-            page_end=max(block.page for block in buffer),
-            section_path=_build_section_path(buffer),
-            token_count=token_count,
-            allowed_groups=doc.allowed_groups,
-            source_url=doc.source_url,
-            metadata={"chunk_index": chunk_index, "title": doc.title},
+    max_tokens = config.max_tokens
+    for source in blocks:
+        tokens = count_tokens(source.text)
+        pieces = ((source, tokens),) if tokens <= max_tokens else _split_block(source, max_tokens, count_tokens)
+        for block, tokens in pieces:
+            if buffer.blocks and not buffer.fits(tokens, max_tokens):
+                # A buffer of carried-over overlap alone was already emitted.
+                if buffer.has_new:
+                    yield _build_chunk(doc, buffer, chunk_index, count_tokens)
+                    chunk_index += 1
+                    buffer.keep_tail(config.overlap_tokens)
+                if not buffer.fits(tokens, max_tokens):
+                    buffer.clear()
+            buffer.append(block, tokens, headings.push(block))
+            if buffer.tokens >= config.target_tokens:
+                yield _build_chunk(doc, buffer, chunk_index, count_tokens)
+                chunk_index += 1
+                buffer.keep_tail(config.overlap_tokens)
+            if buffer.tokens >= max_tokens:
+                if buffer.has_new:
+                    yield _build_chunk(doc, buffer, chunk_index, count_tokens)
+                    chunk_index += 1
+                    buffer.keep_tail(config.overlap_tokens)
+                else:
+                    buffer.clear()
+
+    if buffer.has_new:
+        yield _build_chunk(doc, buffer, chunk_index, count_tokens)
+
+
+def _iter_semantic_chunks(
+    blocks: Sequence[DocumentBlock],
+    config: ChunkingConfig,
+    doc: DocumentRevision,
+    embedder: EmbeddingProvider,
+) -> Iterator[Chunk]:
+    """Cut chunks where adjacent blocks drift apart in embedding space.
+
+    Oversized blocks are split first and the pieces are embedded in a single
+    ``embed`` call, so no input exceeds ``max_tokens``. A cut happens before a
+    block whose distance to its predecessor is in the top
+    ``100 - breakpoint_percentile`` percent, once the open chunk holds at least
+    ``min_tokens``; ``max_tokens`` is never exceeded by choice.
+    """
+
+    if not blocks:
+        return
+    count_tokens = config.tokenizer.count_tokens
+    # (piece, tokens, whether it starts a source block)
+    pieces: List[Tuple[DocumentBlock, int, bool]] = []
+    for source in blocks:
+        tokens = count_tokens(source.text)
+        split = (
+            ((source, tokens),)
+            if tokens <= config.max_tokens
+            else _split_block(source, config.max_tokens, count_tokens)
         )
-        chunks.append(chunk)
-        chunk_index += 1
-        # apply overlap
-        buffer = _tail_within_tokens(buffer, config.overlap_tokens)
-        buffer_tokens = sum(_estimate_tokens(block.text) for block in buffer)
-
-    for block in doc.blocks:
-        buffer.append(block)
-        buffer_tokens += _estimate_tokens(block.text)
-        if buffer_tokens >= config.target_tokens:
-            flush()
-        if buffer_tokens >= config.max_tokens:
-            flush(force=True)
-
-    flush(force=True)
-    return chunks
-
-
-def _tail_within_tokens(blocks: Sequence[DocumentBlock], max_tokens: int) -> List[DocumentBlock]:
-    tail: List[DocumentBlock] = []
-    total = 0
-    for block in reversed(blocks):
-        tokens = _estimate_tokens(block.text)
-        if total + tokens > max_tokens and tail:
+        pieces.extend((block, tokens, index == 0) for index, (block, tokens) in enumerate(split))
+    distances = _adjacent_cosine_distances(embedder.embed([block.text for block, _, _ in pieces]))
+    # Pieces of one split block never count as a topic shift.
+    boundaries = [distances[position - 1] for position in range(1, len(pieces)) if pieces[position][2]]
+    threshold = float(np.percentile(boundaries, config.breakpoint_percentile)) if boundaries else 0.0
+    headings = _HeadingStack()
+    buffer = _ChunkBuffer()
+    chunk_index = 0
+
+    for position, (block, tokens, starts_block) in enumerate(pieces):
+        shifted = starts_block and position > 0 and distances[position - 1] >= threshold
+        if buffer.blocks:
+            topic_shift = shifted and buffer.tokens >= config.min_tokens
+            if topic_shift or not buffer.fits(tokens, config.max_tokens):
+                yield _build_chunk(doc, buffer, chunk_index, count_tokens)
+                chunk_index += 1
+                buffer.clear()
+        buffer.append(block, tokens, headings.push(block))
+
+    if buffer.blocks:
+        yield _build_chunk(doc, buffer, chunk_index, count_tokens)
+
+
+def _adjacent_cosine_distances(vectors: Sequence[Sequence[float]]) -> np.ndarray:
+    """``1 - cos(v[i], v[i + 1])`` for each adjacent pair, computed row-wise."""
+
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    unit = matrix / np.where(norms == 0, 1.0, norms)
+    return 1.0 - np.einsum("ij,ij->i", unit[:-1], unit[1:])
+
+
+# Coarsest boundary first: lines (tables, lists), then sentences, then words.
+_SPLIT_LEVELS = (
+    (re.compile(r"\s*\n\s*"), "\n"),
+    (re.compile(r"(?<=[.!?;])\s+"), " "),
+    (re.compile(r"\s+"), " "),
+)
+
+
+def _split_block(
+    block: DocumentBlock, max_tokens: int, count_tokens: Callable[[str], int]
+) -> List[Tuple[DocumentBlock, int]]:
+    """Split an oversized block into same-page pieces that each fit ``max_tokens``."""
+
+    return [
+        (DocumentBlock(page=block.page, kind=block.kind, text=piece), count_tokens(piece))
+        for piece in _split_text(block.text, max_tokens, count_tokens)
+    ]
+
+
+def _split_text(text: str, max_tokens: int, count_tokens: Callable[[str], int], level: int = 0) -> List[str]:
+    """Split ``text`` at the coarsest boundary that yields pieces within ``max_tokens``.
+
+    Parts are packed greedily, charging one extra token per joint as an upper
+    bound on separator cost, and every packed piece is re-counted so the limit
+    holds for the actual tokenizer. Text with no boundaries left is halved.
+    """
+
+    if count_tokens(text) <= max_tokens or len(text) <= 1:
+        return [text]
+    for depth in range(level, len(_SPLIT_LEVELS)):
+        pattern, joiner = _SPLIT_LEVELS[depth]
+        parts = [part for part in pattern.split(text) if part]
+        if len(parts) > 1:
             break
-        tail.append(block)
-        total += tokens
-    return list(reversed(tail))
+    else:
+        middle = len(text) // 2
+        return _split_text(text[:middle], max_tokens, count_tokens, level) + _split_text(
+            text[middle:], max_tokens, count_tokens, level
+        )
+
+    groups: List[List[str]] = []
+    group_tokens = 0
+    for part in parts:
+        part_tokens = count_tokens(part)
+        if groups and group_tokens + 1 + part_tokens <= max_tokens:
+            groups[-1].append(part)
+            group_tokens += 1 + part_tokens
+        else:
+            groups.append([part])
+            group_tokens = part_tokens
+    if len(groups) == 1:
+        middle = len(parts) // 2
+        groups = [parts[:middle], parts[middle:]]
+
+    pieces: List[str] = []
+    for group in groups:
+        pieces.extend(_split_text(joiner.join(group), max_tokens, count_tokens, depth))
+    return pieces
+
+
+class _ChunkBuffer:
+    """Open chunk buffer with per-block token counts cached as prefix sums.
+
+    ``prefix[i]`` is the token total of ``blocks[:i]`` so buffer size is O(1)
+    and the overlap tail is a binary search instead of a rescan. ``carried``
+    counts the leading blocks kept as overlap from the previous chunk.
+    """
+
+    __slots__ = ("blocks", "prefix", "paths", "carried")
+
+    def __init__(self) -> None:
+        self.blocks: List[DocumentBlock] = []
+        self.prefix: List[int] = [0]
+        self.paths: List[Optional[str]] = []
+        self.carried = 0
+
+    @property
+    def tokens(self) -> int:
+        return self.prefix[-1] - self.prefix[0]
+
+    @property
+    def has_new(self) -> bool:
+        """Whether any block arrived after the last emitted chunk."""
+
+        return len(self.blocks) > self.carried
+
+    def fits(self, tokens: int, max_tokens: int) -> bool:
+        """Whether a block of ``tokens`` can join without the chunk exceeding ``max_tokens``.
+
+        Each newline joint is charged one token so the bound holds for the
+        joined chunk text, not just the sum of block counts.
+        """
+
+        return self.tokens + len(self.blocks) + tokens <= max_tokens
+
+    def append(self, block: DocumentBlock, tokens: int, section_path: Optional[str]) -> None:
+        self.blocks.append(block)
+        self.prefix.append(self.prefix[-1] + tokens)
+        self.paths.append(section_path)
+
+    def keep_tail(self, max_tokens: int) -> None:
+        """Drop leading blocks, keeping the longest suffix within ``max_tokens``.
+
+        At least one block is always kept, matching the original overlap rule.
+        """
+
+        if not self.blocks:
+            return
+        last = len(self.blocks) - 1
+        start = bisect_left(self.prefix, self.prefix[-1] - max_tokens, 0, last)
+        del self.blocks[:start]
+        del self.prefix[:start]
+        del self.paths[:start]
+        self.carried = len(self.blocks)
+
+    def clear(self) -> None:
+        self.blocks.clear()
+        del self.prefix[:-1]
+        self.paths.clear()
+        self.carried = 0
+
+
+def _build_chunk(
+    doc: DocumentRevision,
+    buffer: _ChunkBuffer,
+    chunk_index: int,
+    count_tokens: Callable[[str], int],
+) -> Chunk:
+    blocks = buffer.blocks
+    text = "\n".join(block.text for block in blocks)
+    return Chunk(
+        chunk_id=f"{doc.doc_id}:{doc.rev}:{chunk_index:04d}",
+        doc_id=doc.doc_id,
+        rev=doc.rev,
+        text=text,
+        page_start=min(block.page for block in blocks),
+        page_end=max(block.page for block in blocks),
+        section_path=buffer.paths[0],
+        token_count=count_tokens(text),
+        allowed_groups=doc.allowed_groups,
+        source_url=doc.source_url,
+        metadata={"chunk_index": chunk_index, "title": doc.title},
+    )
+
+
+_HEADING_KIND = re.compile(r"^(?:heading|h)[-_ ]?(\d+)$")
+_NUMBERED_HEADING = re.compile(r"^(\d+(?:\.\d+)*)[.)]?\s")
+
+
+def _heading_level(block: DocumentBlock) -> Optional[int]:
+    """Return the heading depth of ``block`` or ``None`` for body blocks.
+
+    Levels come from the block kind (``h2``, ``heading-3``) or, for plain
+    ``heading`` blocks, from outline numbering such as ``3.2.1 Torque``.
+    """
+
+    level = _kind_level(block.kind)
+    if level == 0:
+        numbered = _NUMBERED_HEADING.match(block.text.strip())
+        return numbered.group(1).count(".") + 1 if numbered else 1
+    return level
+
+
+@lru_cache(maxsize=256)
+def _kind_level(kind: str) -> Optional[int]:
+    # 0 marks a plain "heading" whose depth comes from its numbering.
+    kind = kind.lower()
+    if kind == "heading":
+        return 0
+    match = _HEADING_KIND.match(kind)
+    return int(match.group(1)) if match else None
+
+
+class _HeadingStack:
+    """Open headings at the current position; yields each block's section path."""
+
+    __slots__ = ("_stack", "_path")
+
+    def __init__(self) -> None:
+        self._stack: List[Tuple[int, str]] = []
+        self._path: Optional[str] = None
+
+    def push(self, block: DocumentBlock) -> Optional[str]:
+        level = _heading_level(block)
+        if level is not None:
+            while self._stack and self._stack[-1][0] >= level:
+                self._stack.pop()
+            self._stack.append((level, block.text.strip()))
+            # One shared string per section rather than one per block.
+            self._path = " > ".join(title for _, title in self._stack)
+        return self._path
+
+
+class SectionIndex:
+    """Section path for every block of a revision, built in a single pass.
+
+    ``path_for`` is an O(1) lookup by block position, and ``blocks_in``
+    returns the block positions that belong to a section (including its
+    sub-sections), which serves "section X of doc Y" lookups. A path that
+    occurs more than once keeps one span per occurrence, so blocks between
+    the occurrences are not swept in.
+    """
+
+    def __init__(self, paths: List[Optional[str]]) -> None:
+        self.paths = paths
+        self._spans: Dict[str, List[List[int]]] = {}
+        for position, path in enumerate(paths):
+            while path:
+                spans = self._spans.setdefault(path, [])
+                if spans and spans[-1][1] == position - 1:
+                    spans[-1][1] = position
+                else:
+                    spans.append([position, position])
+                path, _, _ = path.rpartition(" > ")
+
+    @classmethod
+    def build(cls, blocks: Iterable[DocumentBlock]) -> "SectionIndex":
+        headings = _HeadingStack()
+        return cls([headings.push(block) for block in blocks])
+
+    def path_for(self, position: int) -> Optional[str]:
+        return self.paths[position]
 
+    def blocks_in(self, section_path: str) -> List[int]:
+        return [
+            position
+            for start, end in self._spans.get(section_path, ())
+            for position in range(start, end + 1)
+        ]
 
-def _build_section_path(blocks: Iterable[DocumentBlock]) -> str | None:
-    headings = [block.text.strip() for block in blocks if block.kind == "heading"]
-    if not headings:
-        return None
-    return " > ".join(dict.fromkeys(headings))
+    def sections(self) -> List[str]:
+        return list(self._spans)
 
 
-__all__ = ["ChunkingConfig", "chunk_document"]
+__all__ = ["CHUNKING_MODES", "ChunkingConfig", "SectionIndex", "chunk_document", "iter_chunks"]
@@ -2,18 +2,42 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 import typer
 
-from .chunking import ChunkingConfig, chunk_document
+from .boilerplate import BoilerplateFilter
+from .chunking import CHUNKING_MODES, ChunkingConfig, iter_chunks
 from .config import PipelineSettings, load_settings
-from .embeddings import MockEmbeddingProvider, OpenAICompatibleEmbeddingProvider
+from .embedding_cache import CachedEmbeddingProvider
+from .embeddings import (
+    AsyncOpenAICompatibleEmbeddingProvider,
+    MockEmbeddingProvider,
+    OpenAICompatibleEmbeddingProvider,
+    QueryEmbeddingCache,
+    SyncEmbeddingProvider,
+)
+from .http_client import HTTPClientFactory
 from .indexing import AzureSearchIndexer, JSONLIndexer
-from .models import DocumentRevision, EmbeddedChunk
+from .ingestion import (
+    ChunkedDocument,
+    EmbeddingReuse,
+    IngestStats,
+    batched,
+    default_worker_count,
+    discover_documents,
+    embed_chunks,
+    iter_chunked_corpus,
+    iter_chunked_documents,
+    read_manifest,
+)
+from .loading import NDJSONCorpus, stream_revision
+from .models import Chunk
+from .ratelimit import RateLimiter, RetryPolicy
 from .retrieval import AzureSearchRetriever
 from .reranking import EmbeddingSimilarityReranker, take_top_n
 from .grounding import build_grounding_pack, summarize_grounding_pack
+from .tokenization import load_bpe_tokenizer
 
 app = typer.Typer(help="Agentic RAG ingestion, indexing, and retrieval helpers")
 
@@ -22,25 +46,109 @@ def _resolve_settings(config_file: Optional[Path]) -> PipelineSettings:
     return load_settings(config_file)
 
 
-def _build_embedding_provider(settings: PipelineSettings):
+def _embedding_model_label(settings: PipelineSettings) -> str:
+    # Mock vectors must never be served or reused for the real model, or vice versa.
+    return "mock" if settings.mock_embeddings else settings.embedding.model
+
+
+def _build_embedding_provider(settings: PipelineSettings, http: Optional[HTTPClientFactory] = None):
+    provider = _build_base_embedding_provider(settings, http)
+    embedding = settings.embedding
+    if not embedding.cache_path:
+        return provider
+    return CachedEmbeddingProvider(
+        provider,
+        Path(embedding.cache_path),
+        model=_embedding_model_label(settings),
+        dimensions=embedding.dimensions or 0,
+        max_bytes=embedding.cache_max_mb << 20,
+    )
+
+
+def _build_base_embedding_provider(settings: PipelineSettings, http: Optional[HTTPClientFactory]):
+    embedding = settings.embedding
     if settings.mock_embeddings:
-        return MockEmbeddingProvider()
+        return MockEmbeddingProvider(dim=embedding.dimensions or 1536)
+    rate_limiter = None
+    if embedding.requests_per_minute or embedding.tokens_per_minute:
+        rate_limiter = RateLimiter(embedding.requests_per_minute, embedding.tokens_per_minute)
+    options = dict(
+        timeout=embedding.timeout,
+        max_batch_items=embedding.max_batch_items,
+        max_batch_tokens=embedding.max_batch_tokens,
+        rate_limiter=rate_limiter,
+        retry=RetryPolicy(max_retries=embedding.max_retries),
+        encoding_format=embedding.encoding_format,
+        dimensions=embedding.dimensions,
+        truncate_locally=embedding.truncate_locally,
+        http=http,
+    )
+    if embedding.concurrency > 1:
+        return SyncEmbeddingProvider(
+            AsyncOpenAICompatibleEmbeddingProvider(
+                embedding.base_url,
+                embedding.api_key,
+                embedding.model,
+                concurrency=embedding.concurrency,
+                **options,
+            )
+        )
     return OpenAICompatibleEmbeddingProvider(
-        base_url=settings.embedding.base_url,
-        api_key=settings.embedding.api_key,
-        model=settings.embedding.model,
+        embedding.base_url, embedding.api_key, embedding.model, **options
     )
 
 
-def _indexer_from_settings(settings: PipelineSettings, output_path: Optional[Path]):
+def _report_embedding_stats(provider: object) -> None:
+    stats = getattr(provider, "stats", None)
+    if stats is not None and stats.requests:
+        typer.echo(f"Embedded {stats.summary()}")
+    requested = getattr(provider, "texts_requested", 0)
+    if requested:
+        repeated = requested - provider.texts_embedded
+        typer.echo(f"Deduplicated {repeated} of {requested} texts ({provider.dedupe_ratio:.1%})")
+    if isinstance(provider, CachedEmbeddingProvider):
+        typer.echo(provider.summary())
+
+
+def _indexer_from_settings(
+    settings: PipelineSettings, output_path: Optional[Path], http: Optional[HTTPClientFactory] = None
+):
+    dimensions = settings.embedding.dimensions
     if output_path:
-        return JSONLIndexer(output_path)
+        return JSONLIndexer(output_path, dimensions=dimensions)
     if settings.azure_search:
         azure = settings.azure_search
-        return AzureSearchIndexer(azure.endpoint, azure.api_key, azure.index_name)
+        return AzureSearchIndexer(
+            azure.endpoint, azure.api_key, azure.index_name, dimensions=dimensions, http=http
+        )
     raise typer.BadParameter("Either --output-path or Azure Search settings are required")
 
 
+def _build_chunking_config(
+    target_tokens: int,
+    overlap_tokens: int,
+    tokenizer_vocab: Optional[Path],
+    tokenizer_merges: Optional[Path],
+    mode: str = "fixed",
+) -> ChunkingConfig:
+    if mode not in CHUNKING_MODES:
+        raise typer.BadParameter(f"--chunking-mode must be one of {', '.join(CHUNKING_MODES)}")
+    config = ChunkingConfig(target_tokens=target_tokens, overlap_tokens=overlap_tokens, mode=mode)
+    if tokenizer_vocab or tokenizer_merges:
+        if not (tokenizer_vocab and tokenizer_merges):
+            raise typer.BadParameter("--tokenizer-vocab and --tokenizer-merges must be given together")
+        config.tokenizer = load_bpe_tokenizer(tokenizer_vocab, tokenizer_merges)
+    return config
+
+
+def _build_boilerplate_filter(
+    strip_boilerplate: bool, collapse_boilerplate: bool, chunking_config: ChunkingConfig
+) -> Optional[BoilerplateFilter]:
+    if not (strip_boilerplate or collapse_boilerplate):
+        return None
+    return BoilerplateFilter(collapse=collapse_boilerplate, tokenizer=chunking_config.tokenizer)
+
+
 def _close_resource(resource: object) -> None:
     close = getattr(resource, "close", None)
     if callable(close):  # pragma: no branch - trivial guard
@@ -57,33 +165,235 @@ def ingest_document(
     ),
     target_tokens: int = typer.Option(500, min=200, max=1200, help="Chunk target size"),
     overlap_tokens: int = typer.Option(75, min=0, max=200, help="Overlap tokens"),
+    batch_size: int = typer.Option(
+        64, min=1, help="Chunks embedded and uploaded per request while streaming"
+    ),
+    tokenizer_vocab: Optional[Path] = typer.Option(
+        None, help="BPE vocab.json for exact token counts (defaults to the word heuristic)"
+    ),
+    tokenizer_merges: Optional[Path] = typer.Option(None, help="BPE merges.txt paired with --tokenizer-vocab"),
+    previous_chunks: Optional[Path] = typer.Option(
+        None,
+        help="JSONL export of the previous revision; unchanged chunks keep their vectors.",
+    ),
+    chunking_mode: str = typer.Option(
+        "fixed",
+        help="'fixed' token windows with overlap, or 'semantic' cuts at topic shifts "
+        "(one extra batched embedding call per document).",
+    ),
+    strip_boilerplate: bool = typer.Option(
+        False, help="Drop header/footer/legend blocks repeated across most pages before chunking"
+    ),
+    collapse_boilerplate: bool = typer.Option(
+        False, help="Like --strip-boilerplate but keep the first occurrence of each repeated block"
+    ),
 ) -> None:
     """Chunk, embed, and index a normalized document."""
 
     settings = _resolve_settings(config_file)
-    chunking_config = ChunkingConfig(target_tokens=target_tokens, overlap_tokens=overlap_tokens)
-    document = DocumentRevision.from_json(document_path)
-    chunks = chunk_document(document, chunking_config)
-    typer.echo(f"Generated {len(chunks)} chunks for {document.doc_id} Rev {document.rev}")
-
-    provider = _build_embedding_provider(settings)
-    vectors = provider.embed([chunk.text for chunk in chunks])
-
-    embedded_chunks: List[EmbeddedChunk] = []
-    for chunk, vector in zip(chunks, vectors):
-        embedded_chunks.append(
-            EmbeddedChunk(
-                **chunk.__dict__,
-                embedding=vector,
-                embedding_model=settings.embedding.model,
-            )
+    chunking_config = _build_chunking_config(
+        target_tokens, overlap_tokens, tokenizer_vocab, tokenizer_merges, chunking_mode
+    )
+    document, blocks = stream_revision(document_path)
+    http = HTTPClientFactory(settings.http)
+    provider = _build_embedding_provider(settings, http)
+    indexer = _indexer_from_settings(settings, output_path, http)
+    boilerplate = _build_boilerplate_filter(strip_boilerplate, collapse_boilerplate, chunking_config)
+    if boilerplate is not None:
+        # Page-level repeat counts need the whole document.
+        blocks, report = boilerplate.strip(list(blocks))
+        typer.echo(
+            f"Stripped {report.blocks_removed} boilerplate blocks "
+            f"({report.tokens_removed} tokens, {report.distinct_texts} distinct texts)"
+        )
+    reuse = None
+    if previous_chunks:
+        reuse = EmbeddingReuse.from_jsonl(
+            previous_chunks,
+            doc_id=document.doc_id,
+            embedding_model=_embedding_model_label(settings),
+            dimensions=settings.embedding.dimensions,
         )
 
-    indexer = _indexer_from_settings(settings, output_path)
-    indexer.upload(embedded_chunks)
-    typer.echo(f"Uploaded {len(embedded_chunks)} chunks")
+    uploaded = 0
+    chunks = iter_chunks(blocks, chunking_config, doc=document, embedder=provider)
+    for batch in batched(chunks, batch_size):
+        embedded = embed_chunks(batch, provider, _embedding_model_label(settings), reuse)
+        indexer.upload(embedded)
+        uploaded += len(embedded)
+
+    typer.echo(f"Generated {uploaded} chunks for {document.doc_id} Rev {document.rev}")
+    if reuse is not None:
+        typer.echo(reuse.summary())
+    typer.echo(f"Uploaded {uploaded} chunks")
+    _report_embedding_stats(provider)
     _close_resource(indexer)
     _close_resource(provider)
+    http.close()
+
+
+@app.command()
+def ingest_directory(
+    directory: Path = typer.Argument(..., help="Directory of normalized document JSON files"),
+    config_file: Optional[Path] = typer.Option(None, help="Path to YAML config file"),
+    output_path: Optional[Path] = typer.Option(
+        None,
+        help="Optional JSONL output. If omitted, Azure Search settings must be provided.",
+    ),
+    pattern: str = typer.Option("*.json", help="Glob used to select documents"),
+    recursive: bool = typer.Option(False, help="Descend into sub-directories"),
+    workers: int = typer.Option(default_worker_count(), min=1, help="Chunking processes"),
+    target_tokens: int = typer.Option(500, min=200, max=1200, help="Chunk target size"),
+    overlap_tokens: int = typer.Option(75, min=0, max=200, help="Overlap tokens"),
+    batch_size: int = typer.Option(64, min=1, help="Chunks per embedding/upload request"),
+    tokenizer_vocab: Optional[Path] = typer.Option(None, help="BPE vocab.json for exact token counts"),
+    tokenizer_merges: Optional[Path] = typer.Option(None, help="BPE merges.txt paired with --tokenizer-vocab"),
+    strip_boilerplate: bool = typer.Option(
+        False, help="Drop header/footer/legend blocks repeated across most pages before chunking"
+    ),
+    collapse_boilerplate: bool = typer.Option(
+        False, help="Like --strip-boilerplate but keep the first occurrence of each repeated block"
+    ),
+) -> None:
+    """Chunk a directory of documents in parallel and embed/index them in shared batches."""
+
+    paths = discover_documents(directory, pattern, recursive)
+    chunking_config = _build_chunking_config(
+        target_tokens, overlap_tokens, tokenizer_vocab, tokenizer_merges
+    )
+    boilerplate = _build_boilerplate_filter(strip_boilerplate, collapse_boilerplate, chunking_config)
+    typer.echo(f"Ingesting {len(paths)} documents with {workers} chunking workers")
+    _ingest_many(
+        iter_chunked_documents(paths, chunking_config, workers=workers, boilerplate=boilerplate),
+        total=len(paths),
+        config_file=config_file,
+        output_path=output_path,
+        batch_size=batch_size,
+    )
+
+
+@app.command()
+def ingest_manifest(
+    manifest_path: Path = typer.Argument(..., help="Text file listing one document path per line"),
+    config_file: Optional[Path] = typer.Option(None, help="Path to YAML config file"),
+    output_path: Optional[Path] = typer.Option(
+        None,
+        help="Optional JSONL output. If omitted, Azure Search settings must be provided.",
+    ),
+    workers: int = typer.Option(default_worker_count(), min=1, help="Chunking processes"),
+    target_tokens: int = typer.Option(500, min=200, max=1200, help="Chunk target size"),
+    overlap_tokens: int = typer.Option(75, min=0, max=200, help="Overlap tokens"),
+    batch_size: int = typer.Option(64, min=1, help="Chunks per embedding/upload request"),
+    tokenizer_vocab: Optional[Path] = typer.Option(None, help="BPE vocab.json for exact token counts"),
+    tokenizer_merges: Optional[Path] = typer.Option(None, help="BPE merges.txt paired with --tokenizer-vocab"),
+    strip_boilerplate: bool = typer.Option(
+        False, help="Drop header/footer/legend blocks repeated across most pages before chunking"
+    ),
+    collapse_boilerplate: bool = typer.Option(
+        False, help="Like --strip-boilerplate but keep the first occurrence of each repeated block"
+    ),
+) -> None:
+    """Chunk the documents listed in a manifest in parallel and embed/index them."""
+
+    paths = read_manifest(manifest_path)
+    chunking_config = _build_chunking_config(
+        target_tokens, overlap_tokens, tokenizer_vocab, tokenizer_merges
+    )
+    boilerplate = _build_boilerplate_filter(strip_boilerplate, collapse_boilerplate, chunking_config)
+    typer.echo(f"Ingesting {len(paths)} documents with {workers} chunking workers")
+    _ingest_many(
+        iter_chunked_documents(paths, chunking_config, workers=workers, boilerplate=boilerplate),
+        total=len(paths),
+        config_file=config_file,
+        output_path=output_path,
+        batch_size=batch_size,
+    )
+
+
+@app.command()
+def ingest_corpus(
+    corpus_path: Path = typer.Argument(..., help="NDJSON file with one normalized revision per line"),
+    config_file: Optional[Path] = typer.Option(None, help="Path to YAML config file"),
+    output_path: Optional[Path] = typer.Option(
+        None,
+        help="Optional JSONL output. If omitted, Azure Search settings must be provided.",
+    ),
+    workers: int = typer.Option(default_worker_count(), min=1, help="Chunking processes"),
+    target_tokens: int = typer.Option(500, min=200, max=1200, help="Chunk target size"),
+    overlap_tokens: int = typer.Option(75, min=0, max=200, help="Overlap tokens"),
+    batch_size: int = typer.Option(64, min=1, help="Chunks per embedding/upload request"),
+    tokenizer_vocab: Optional[Path] = typer.Option(None, help="BPE vocab.json for exact token counts"),
+    tokenizer_merges: Optional[Path] = typer.Option(None, help="BPE merges.txt paired with --tokenizer-vocab"),
+    strip_boilerplate: bool = typer.Option(
+        False, help="Drop header/footer/legend blocks repeated across most pages before chunking"
+    ),
+    collapse_boilerplate: bool = typer.Option(
+        False, help="Like --strip-boilerplate but keep the first occurrence of each repeated block"
+    ),
+) -> None:
+    """Chunk an NDJSON corpus in parallel byte ranges and embed/index every revision."""
+
+    chunking_config = _build_chunking_config(
+        target_tokens, overlap_tokens, tokenizer_vocab, tokenizer_merges
+    )
+    boilerplate = _build_boilerplate_filter(strip_boilerplate, collapse_boilerplate, chunking_config)
+    with NDJSONCorpus(corpus_path) as corpus:
+        total = corpus.count_lines()
+    typer.echo(f"Ingesting {total} revisions from {corpus_path} with {workers} chunking workers")
+    _ingest_many(
+        iter_chunked_corpus(corpus_path, chunking_config, workers=workers, boilerplate=boilerplate),
+        total=total,
+        config_file=config_file,
+        output_path=output_path,
+        batch_size=batch_size,
+    )
+
+
+def _ingest_many(
+    results: Iterable[ChunkedDocument],
+    *,
+    total: int,
+    config_file: Optional[Path],
+    output_path: Optional[Path],
+    batch_size: int,
+    progress_every: int = 100,
+) -> IngestStats:
+    settings = _resolve_settings(config_file)
+    http = HTTPClientFactory(settings.http)
+    provider = _build_embedding_provider(settings, http)
+    indexer = _indexer_from_settings(settings, output_path, http)
+    stats = IngestStats()
+    pending: List[Chunk] = []
+
+    def drain(final: bool = False) -> None:
+        nonlocal pending
+        while len(pending) >= batch_size or (final and pending):
+            batch, pending = pending[:batch_size], pending[batch_size:]
+            indexer.upload(embed_chunks(batch, provider, _embedding_model_label(settings)))
+            stats.chunks += len(batch)
+
+    try:
+        for result in results:
+            if result.error is not None:
+                stats.failed.append((result.label, result.error))
+                typer.echo(f"Failed to chunk {result.label}: {result.error}")
+                continue
+            stats.documents += 1
+            if result.boilerplate is not None:
+                stats.boilerplate_tokens_removed += result.boilerplate.tokens_removed
+            pending.extend(result.chunks)
+            drain()
+            if stats.documents % progress_every == 0:
+                typer.echo(f"[{stats.documents}/{total}] {stats.summary()}")
+        drain(final=True)
+    finally:
+        _close_resource(indexer)
+        _close_resource(provider)
+        http.close()
+
+    typer.echo(f"Done: {stats.summary()}")
+    _report_embedding_stats(provider)
+    return stats
 
 
 @app.command()
@@ -111,11 +421,20 @@ def query(
     settings = _resolve_settings(config_file)
     if not settings.azure_search:
         raise typer.BadParameter("Azure Search settings are required for querying")
-    provider = _build_embedding_provider(settings)
+    http = HTTPClientFactory(settings.http)
+    provider = _build_embedding_provider(settings, http)
+    query_cache = QueryEmbeddingCache(
+        provider,
+        maxsize=settings.retrieval.query_cache_size,
+        ttl_seconds=settings.retrieval.query_cache_ttl_seconds,
+    )
     retriever = AzureSearchRetriever(
         settings.azure_search,
         provider,
         semantic_configuration=settings.retrieval.semantic_configuration,
+        query_cache=query_cache,
+        dimensions=settings.embedding.dimensions,
+        http=http,
     )
     candidate_k = top_k or settings.retrieval.candidate_k
     results = retriever.retrieve(query_text, user_group, top_k=candidate_k)
@@ -124,7 +443,7 @@ def query(
     reranked = results
     rerank_chunks = final_chunks or settings.retrieval.final_context_chunks
     if settings.rerank.enabled and not disable_rerank:
-        reranker = EmbeddingSimilarityReranker(provider)
+        reranker = EmbeddingSimilarityReranker(provider, query_cache=query_cache)
         rerank_depth = min(settings.rerank.max_to_score, len(results))
         candidates = take_top_n(results, rerank_depth)
         reranked = reranker.rerank(query_text, candidates, rerank_depth)
@@ -143,6 +462,7 @@ def query(
 
     _close_resource(retriever)
     _close_resource(provider)
+    http.close()
 
 
 if __name__ == "__main__":
@@ -20,6 +20,18 @@ class ModelEndpointSettings:
     api_key: str
     model: str
     deployment: Optional[str] = None
+    timeout: float = 30.0
+    max_batch_items: int = 256
+    max_batch_tokens: int = 100_000
+    concurrency: int = 1
+    cache_path: Optional[str] = None
+    cache_max_mb: int = 1024
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+    max_retries: int = 6
+    encoding_format: str = "base64"
+    dimensions: Optional[int] = None
+    truncate_locally: bool = False
 
 
 @dataclass(slots=True)
@@ -36,6 +48,8 @@ class RetrievalSettings:
     candidate_k: int = 60
     final_context_chunks: int = 12
     semantic_configuration: Optional[str] = None
+    query_cache_size: int = 1024
+    query_cache_ttl_seconds: float = 3600.0
 
 
 @dataclass(slots=True)
@@ -46,6 +60,17 @@ class RerankSettings:
     max_to_score: int = 40
 
 
+@dataclass(slots=True)
+class HTTPSettings:
+    """Connection pooling shared by the embedding, indexing and search clients."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    per_host_max_connections: Dict[str, int] = field(default_factory=dict)
+
+
 @dataclass(slots=True)
 class PipelineSettings:
     embedding: ModelEndpointSettings
@@ -54,6 +79,7 @@ class PipelineSettings:
     azure_search: Optional[AzureSearchSettings] = None
     retrieval: RetrievalSettings = field(default_factory=RetrievalSettings)
     rerank: RerankSettings = field(default_factory=RerankSettings)
+    http: HTTPSettings = field(default_factory=HTTPSettings)
 
 
 def _load_yaml(config_path: Optional[Path]) -> Dict[str, Any]:
@@ -73,21 +99,44 @@ def _read_bool(value: Optional[str], default: bool = False) -> bool:
     return value.lower() in {"1", "true", "yes", "on"}
 
 
+def _optional_int(name: str, default: Optional[Any]) -> Optional[int]:
+    value = _env_optional(name, default)
+    return int(value) if value not in (None, "") else None
+
+
 def _load_embedding(data: Dict[str, Any]) -> ModelEndpointSettings:
     cfg = data.get("embedding", {})
     return ModelEndpointSettings(
         base_url=_env_or("EMBEDDING__BASE_URL", cfg.get("base_url")),
         api_key=_env_or("EMBEDDING__API_KEY", cfg.get("api_key")),
         model=_env_or("EMBEDDING__MODEL", cfg.get("model")),
-        deployment=_env_or("EMBEDDING__DEPLOYMENT", cfg.get("deployment")),
+        deployment=_env_optional("EMBEDDING__DEPLOYMENT", cfg.get("deployment")),
+        timeout=float(os.getenv(f"{ENV_PREFIX}EMBEDDING__TIMEOUT") or cfg.get("timeout", 30.0)),
+        max_batch_items=int(
+            os.getenv(f"{ENV_PREFIX}EMBEDDING__MAX_BATCH_ITEMS") or cfg.get("max_batch_items", 256)
+        ),
+        max_batch_tokens=int(
+            os.getenv(f"{ENV_PREFIX}EMBEDDING__MAX_BATCH_TOKENS") or cfg.get("max_batch_tokens", 100_000)
+        ),
+        concurrency=int(os.getenv(f"{ENV_PREFIX}EMBEDDING__CONCURRENCY") or cfg.get("concurrency", 1)),
+        cache_path=_env_optional("EMBEDDING__CACHE_PATH", cfg.get("cache_path")),
+        cache_max_mb=int(os.getenv(f"{ENV_PREFIX}EMBEDDING__CACHE_MAX_MB") or cfg.get("cache_max_mb", 1024)),
+        requests_per_minute=_optional_int("EMBEDDING__REQUESTS_PER_MINUTE", cfg.get("requests_per_minute")),
+        tokens_per_minute=_optional_int("EMBEDDING__TOKENS_PER_MINUTE", cfg.get("tokens_per_minute")),
+        max_retries=int(os.getenv(f"{ENV_PREFIX}EMBEDDING__MAX_RETRIES") or cfg.get("max_retries", 6)),
+        encoding_format=os.getenv(f"{ENV_PREFIX}EMBEDDING__ENCODING_FORMAT") or cfg.get("encoding_format", "base64"),
+        dimensions=_optional_int("EMBEDDING__DIMENSIONS", cfg.get("dimensions")),
+        truncate_locally=_read_bool(
+            os.getenv(f"{ENV_PREFIX}EMBEDDING__TRUNCATE_LOCALLY"), cfg.get("truncate_locally", False)
+        ),
     )
 
 
 def _load_azure_search(data: Dict[str, Any]) -> Optional[AzureSearchSettings]:
     cfg = data.get("azure_search") or {}
-    endpoint = _env_or("AZURE_SEARCH__ENDPOINT", cfg.get("endpoint"))
-    api_key = _env_or("AZURE_SEARCH__API_KEY", cfg.get("api_key"))
-    index_name = _env_or("AZURE_SEARCH__INDEX_NAME", cfg.get("index_name"))
+    endpoint = _env_optional("AZURE_SEARCH__ENDPOINT", cfg.get("endpoint"))
+    api_key = _env_optional("AZURE_SEARCH__API_KEY", cfg.get("api_key"))
+    index_name = _env_optional("AZURE_SEARCH__INDEX_NAME", cfg.get("index_name"))
     if not all([endpoint, api_key, index_name]):
         return None
     return AzureSearchSettings(endpoint=endpoint, api_key=api_key, index_name=index_name)
@@ -107,10 +156,19 @@ def _load_retrieval(data: Dict[str, Any]) -> RetrievalSettings:
     env_final = os.getenv(f"{ENV_PREFIX}RETRIEVAL__FINAL_CONTEXT_CHUNKS")
     if env_final:
         final_context_chunks = int(env_final)
+    query_cache_size = int(
+        os.getenv(f"{ENV_PREFIX}RETRIEVAL__QUERY_CACHE_SIZE") or cfg.get("query_cache_size", 1024)
+    )
+    query_cache_ttl_seconds = float(
+        os.getenv(f"{ENV_PREFIX}RETRIEVAL__QUERY_CACHE_TTL_SECONDS")
+        or cfg.get("query_cache_ttl_seconds", 3600.0)
+    )
     return RetrievalSettings(
         candidate_k=candidate_k,
         final_context_chunks=final_context_chunks,
         semantic_configuration=semantic_configuration,
+        query_cache_size=query_cache_size,
+        query_cache_ttl_seconds=query_cache_ttl_seconds,
     )
 
 
@@ -127,6 +185,22 @@ def _load_rerank(data: Dict[str, Any]) -> RerankSettings:
     return RerankSettings(enabled=enabled, max_to_score=max_to_score)
 
 
+def _load_http(data: Dict[str, Any]) -> HTTPSettings:
+    cfg = data.get("http") or {}
+    per_host = cfg.get("per_host_max_connections") or {}
+    return HTTPSettings(
+        max_connections=int(os.getenv(f"{ENV_PREFIX}HTTP__MAX_CONNECTIONS") or cfg.get("max_connections", 100)),
+        max_keepalive_connections=int(
+            os.getenv(f"{ENV_PREFIX}HTTP__MAX_KEEPALIVE_CONNECTIONS") or cfg.get("max_keepalive_connections", 20)
+        ),
+        keepalive_expiry=float(
+            os.getenv(f"{ENV_PREFIX}HTTP__KEEPALIVE_EXPIRY") or cfg.get("keepalive_expiry", 30.0)
+        ),
+        http2=_read_bool(os.getenv(f"{ENV_PREFIX}HTTP__HTTP2"), cfg.get("http2", False)),
+        per_host_max_connections={str(host): int(limit) for host, limit in per_host.items()},
+    )
+
+
 def _env_or(key: str, default: Optional[str]) -> str:
     value = os.getenv(f"{ENV_PREFIX}{key}")
     if value is not None:
@@ -136,6 +210,13 @@ def _env_or(key: str, default: Optional[str]) -> str:
     return default
 
 
+def _env_optional(key: str, default: Optional[str]) -> Optional[str]:
+    value = os.getenv(f"{ENV_PREFIX}{key}")
+    if value is not None:
+        return value
+    return default
+
+
 def load_settings(config_path: Optional[Path] = None) -> PipelineSettings:
     data = _load_yaml(config_path)
     embedding = _load_embedding(data)
@@ -146,6 +227,7 @@ def load_settings(config_path: Optional[Path] = None) -> PipelineSettings:
     azure_search = _load_azure_search(data)
     retrieval = _load_retrieval(data)
     rerank = _load_rerank(data)
+    http = _load_http(data)
     return PipelineSettings(
         embedding=embedding,
         environment=environment,
@@ -153,12 +235,14 @@ def load_settings(config_path: Optional[Path] = None) -> PipelineSettings:
         azure_search=azure_search,
         retrieval=retrieval,
         rerank=rerank,
+        http=http,
     )
 
 
 __all__ = [
     "ModelEndpointSettings",
     "AzureSearchSettings",
+    "HTTPSettings",
     "PipelineSettings",
     "RetrievalSettings",
     "RerankSettings",
@@ -0,0 +1,151 @@
+"""Persistent content-addressed cache in front of any embedding provider."""
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .embeddings import EmbeddingCallStats, EmbeddingProvider
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    dimensions INTEGER NOT NULL,
+    text_hash BLOB NOT NULL,
+    vector BLOB NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (model, dimensions, text_hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used);
+"""
+# Stay well below SQLite's bound-parameter limit on older builds (999).
+_LOOKUP_CHUNK = 500
+
+
+def _text_hash(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class CachedEmbeddingProvider(EmbeddingProvider):
+    """Serves repeated texts from a SQLite store keyed by ``(model, dimensions, sha256(text))``.
+
+    Lookups are batched per ``embed`` call (duplicates are already collapsed
+    by ``EmbeddingProvider.embed``), misses are embedded in one call to
+    the wrapped provider and written back, and the least recently used rows
+    are evicted once stored vectors exceed ``max_bytes``. ``dimensions`` is 0
+    when the provider's native size is used.
+    """
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        path: Path,
+        *,
+        model: str,
+        dimensions: int = 0,
+        max_bytes: int = 1 << 30,
+    ) -> None:
+        self.provider = provider
+        self.path = path
+        self.model = model
+        self.dimensions = dimensions
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path))
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        (stored,) = self._db.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()
+        self._stored_bytes = int(stored)
+
+    @property
+    def stats(self) -> Optional[EmbeddingCallStats]:
+        return getattr(self.provider, "stats", None)
+
+    def _embed_unique(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return self.provider.embed(texts)
+        hashes = [_text_hash(text) for text in texts]
+        found = self._lookup(hashes)
+        missing = {key: text for key, text in zip(hashes, texts) if key not in found}
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            fresh = self.provider.embed(list(missing.values()))
+            found.update(zip(missing, fresh))
+            self._store(missing, fresh)
+        return np.stack([found[key] for key in hashes])
+
+    def _lookup(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        found: Dict[bytes, np.ndarray] = {}
+        for start in range(0, len(keys), _LOOKUP_CHUNK):
+            chunk = keys[start : start + _LOOKUP_CHUNK]
+            rows = self._db.execute(
+                "SELECT text_hash, vector FROM embeddings WHERE model = ? AND dimensions = ? "
+                f"AND text_hash IN ({','.join('?' * len(chunk))})",
+                (self.model, self.dimensions, *chunk),
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32)
+        if found:
+            now = time.time_ns()
+            with self._db:
+                self._db.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND dimensions = ? AND text_hash = ?",
+                    [(now, self.model, self.dimensions, key) for key in found],
+                )
+        return found
+
+    def _store(self, missing: Dict[bytes, str], vectors: np.ndarray) -> None:
+        now = time.time_ns()
+        rows = [
+            (self.model, self.dimensions, key, np.ascontiguousarray(vector, dtype=np.float32).tobytes(), now)
+            for key, vector in zip(missing, vectors)
+        ]
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?)", rows)
+        self._stored_bytes += sum(len(row[3]) for row in rows)
+        if self._stored_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        # Trim to 90% of the budget so eviction does not run on every write.
+        target = int(self.max_bytes * 0.9)
+        with self._db:
+            rows = self._db.execute(
+                "SELECT model, dimensions, text_hash, LENGTH(vector) FROM embeddings ORDER BY last_used"
+            )
+            doomed: List[tuple] = []
+            for model, dimensions, key, size in rows:
+                if self._stored_bytes <= target:
+                    break
+                doomed.append((model, dimensions, key))
+                self._stored_bytes -= size
+            self._db.executemany(
+                "DELETE FROM embeddings WHERE model = ? AND dimensions = ? AND text_hash = ?", doomed
+            )
+        self.evicted += len(doomed)
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return (
+            f"Embedding cache: {self.hits} hits, {self.misses} misses ({rate:.0%} hit rate), "
+            f"{self.evicted} evicted, {self._stored_bytes / 2**20:.1f} MiB stored"
+        )
+
+    def close(self) -> None:
+        self._db.close()
+        close = getattr(self.provider, "close", None)
+        if callable(close):
+            close()
+
+
+__all__ = ["CachedEmbeddingProvider"]
@@ -1,66 +1,585 @@
 """Embedding provider abstractions with OpenAI-compatible and mock options."""
 from __future__ import annotations
 
+import asyncio
+import base64
 import hashlib
 import itertools
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Iterable, List, Sequence
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .http_client import HTTPClientFactory, build_async_client, build_client
+from .ratelimit import RETRYABLE_STATUSES, RateLimiter, RetryPolicy, parse_retry_after
+from .tokenization import HeuristicTokenizer, Tokenizer
+
+if TYPE_CHECKING:  # pragma: no cover
+    import httpx
 
 
 class EmbeddingProvider(ABC):
-    """Abstract embedding provider."""
+    """Abstract embedding provider.
+
+    ``embed`` returns a C-contiguous ``(len(texts), dim)`` float32 matrix:
+    4 bytes per dimension instead of a boxed Python float, and ready for
+    vectorized similarity math. Repeated strings within a call (chunk
+    overlap, boilerplate, a query that is also a candidate) are embedded
+    once; subclasses implement ``_embed_unique`` over the distinct texts.
+    """
+
+    texts_requested: int = 0
+    texts_embedded: int = 0
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        positions: Dict[str, int] = {}
+        inverse = [positions.setdefault(text, len(positions)) for text in texts]
+        self.texts_requested += len(texts)
+        self.texts_embedded += len(positions)
+        if len(positions) == len(texts):
+            return self._embed_unique(texts)
+        return self._embed_unique(list(positions))[np.asarray(inverse, dtype=np.intp)]
 
     @abstractmethod
-    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+    def _embed_unique(self, texts: Sequence[str]) -> np.ndarray:
         raise NotImplementedError
 
+    @property
+    def dedupe_ratio(self) -> float:
+        """Share of requested texts that repeated an earlier text in the same call."""
+
+        if not self.texts_requested:
+            return 0.0
+        return 1 - self.texts_embedded / self.texts_requested
+
+    def embed_lists(self, texts: Sequence[str]) -> List[List[float]]:
+        """Compatibility shim for callers that still expect nested lists."""
+
+        return self.embed(texts).tolist()
+
+
+def as_embedding_matrix(vectors: object) -> np.ndarray:
+    """Coerce nested lists or arrays into the float32 matrix contract."""
+
+    return np.ascontiguousarray(vectors, dtype=np.float32)
+
+
+def truncate_embeddings(vectors: np.ndarray, dimensions: Optional[int]) -> np.ndarray:
+    """Keep the first ``dimensions`` components of each vector and rescale to unit length.
+
+    Matryoshka-trained models (``text-embedding-3-*``) front-load information,
+    so this reproduces what their ``dimensions`` request parameter returns.
+    Works on a single vector or a matrix; inputs already at or below the
+    target size are returned unchanged.
+    """
+
+    if not dimensions or vectors.shape[-1] <= dimensions:
+        return vectors
+    truncated = np.array(vectors[..., :dimensions], dtype=np.float32)
+    norms = np.linalg.norm(truncated, axis=-1, keepdims=True)
+    np.divide(truncated, norms, out=truncated, where=norms > 0)
+    return truncated
+
+
+# float32 value of every digest byte, identical to casting ``byte / 255``.
+_BYTE_SCALE = (np.arange(256, dtype=np.float64) / 255).astype(np.float32)
+
+
+def _digests(texts: Sequence[str]) -> bytes:
+    return b"".join(hashlib.sha256(text.encode("utf-8")).digest() for text in texts)
+
 
 class MockEmbeddingProvider(EmbeddingProvider):
-    """Deterministic pseudo-embeddings for tests and offline development."""
+    """Deterministic pseudo-embeddings for tests and offline development.
+
+    Each vector is the text's SHA-256 digest repeated to ``dim`` bytes and
+    scaled to ``[0, 1]``. With ``workers > 1``, batches of at least
+    ``parallel_threshold`` texts are hashed across processes.
+    """
 
-    def __init__(self, dim: int = 1536) -> None:
+    def __init__(self, dim: int = 1536, *, workers: int = 1, parallel_threshold: int = 50_000) -> None:
         self.dim = dim
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
 
-    def embed(self, texts: Sequence[str]) -> List[List[float]]:
-        vectors: List[List[float]] = []
-        for text in texts:
-            digest = hashlib.sha256(text.encode("utf-8")).digest()
-            repeat = (self.dim + len(digest) - 1) // len(digest)
-            raw = (digest * repeat)[: self.dim]
-            vector = [byte / 255 for byte in raw]
-            vectors.append(vector)
-        return vectors
+    def _embed_unique(self, texts: Sequence[str]) -> np.ndarray:
+        if self.workers > 1 and len(texts) >= self.parallel_threshold:
+            digests = self._parallel_digests(texts)
+        else:
+            digests = _digests(texts)
+        raw = np.frombuffer(digests, dtype=np.uint8).reshape(len(texts), 32)
+        repeat = -(-self.dim // 32)
+        return _BYTE_SCALE[np.tile(raw, (1, repeat))[:, : self.dim]]
+
+    def _parallel_digests(self, texts: Sequence[str]) -> bytes:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Only 32-byte digests cross the process boundary; the matrix is built here.
+        size = -(-len(texts) // self.workers)
+        parts = [texts[start : start + size] for start in range(0, len(texts), size)]
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            return b"".join(executor.map(_digests, parts))
+
+
+@dataclass(slots=True)
+class EmbeddingCallStats:
+    """Requests and tokens spent by one ``embed`` call (or summed over many)."""
+
+    texts: int = 0
+    requests: int = 0
+    estimated_tokens: int = 0
+    prompt_tokens: int = 0
+    seconds: float = 0.0
+    retries: int = 0
+    rate_limited: int = 0
+    waited_seconds: float = 0.0
+
+    def add(self, other: "EmbeddingCallStats") -> None:
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def summary(self) -> str:
+        tokens = self.prompt_tokens or self.estimated_tokens
+        kind = "tokens" if self.prompt_tokens else "estimated tokens"
+        summary = f"{self.texts} texts in {self.requests} embedding requests ({tokens} {kind}, {self.seconds:.1f}s)"
+        if self.retries or self.waited_seconds:
+            summary += (
+                f", {self.retries} retries ({self.rate_limited} rate-limited), "
+                f"{self.waited_seconds:.1f}s throttled"
+            )
+        return summary
+
+
+def plan_batches(token_counts: Sequence[int], max_items: int, max_tokens: int) -> List[range]:
+    """Split inputs into contiguous batches within both limits.
+
+    A single text above ``max_tokens`` is sent on its own and left for the
+    endpoint to accept or truncate.
+    """
+
+    batches: List[range] = []
+    start = 0
+    tokens = 0
+    for position, count in enumerate(token_counts):
+        if position > start and (position - start >= max_items or tokens + count > max_tokens):
+            batches.append(range(start, position))
+            start = position
+            tokens = 0
+        tokens += count
+    if start < len(token_counts):
+        batches.append(range(start, len(token_counts)))
+    return batches
+
+
+# Statuses a pre-base64 endpoint answers ``encoding_format: "base64"`` with.
+_REJECTED_REQUEST = frozenset({400, 422})
+
+
+def _rejects_base64(response, encoding_format: str) -> bool:
+    """True when a base64 request failed because of ``encoding_format`` itself.
+
+    Other 400/422s (an over-long input, a bad ``dimensions``) are raised as-is
+    rather than disabling base64 for the rest of the run.
+    """
+
+    return (
+        encoding_format == "base64"
+        and response.status_code in _REJECTED_REQUEST
+        and "encoding_format" in response.text
+    )
+
+
+def _request_body(model: str, inputs: List[str], encoding_format: str, dimensions: Optional[int]) -> dict:
+    body = {"model": model, "input": inputs}
+    if encoding_format != "float":
+        body["encoding_format"] = encoding_format
+    if dimensions:
+        body["dimensions"] = dimensions
+    return body
+
+
+def _decode_vector(vector: object) -> object:
+    """Base64 items are little-endian float32 bytes; float lists pass through."""
+
+    if isinstance(vector, str):
+        return np.frombuffer(base64.b64decode(vector), dtype="<f4")
+    return vector
+
+
+def _store_response(
+    matrix: Optional[np.ndarray],
+    batch: range,
+    payload: dict,
+    total: int,
+    call: EmbeddingCallStats,
+) -> np.ndarray:
+    """Copy one response's vectors into rows ``batch`` of the call's matrix."""
+
+    call.requests += 1
+    call.prompt_tokens += int((payload.get("usage") or {}).get("prompt_tokens") or 0)
+    data = payload["data"]
+    if len(data) != len(batch):
+        raise ValueError(f"Embedding endpoint returned {len(data)} vectors for {len(batch)} inputs")
+    for position, item in enumerate(data):
+        vector = _decode_vector(item["embedding"])
+        if matrix is None:
+            matrix = np.empty((total, len(vector)), dtype=np.float32)
+        # Endpoints may return items out of order; ``index`` is authoritative.
+        matrix[batch.start + item.get("index", position)] = vector
+    return matrix
+
+
+def _retry_delay(
+    retry: RetryPolicy,
+    limiter: Optional[RateLimiter],
+    attempt: int,
+    response: Optional["httpx.Response"],
+    call: EmbeddingCallStats,
+) -> Optional[float]:
+    """Backoff before the next attempt after a retryable failure, or ``None`` to give up.
+
+    ``response`` is ``None`` for transport errors (connect/read timeouts).
+    """
 
+    retry_after = None
+    if response is not None:
+        if response.status_code == 429:
+            call.rate_limited += 1
+        retry_after = parse_retry_after(response.headers)
+        if retry_after is not None and limiter is not None:
+            limiter.pause(retry_after)
+    delay = retry.delay(attempt, retry_after)
+    if delay is not None:
+        call.retries += 1
+        call.waited_seconds += delay
+    return delay
 
-class OpenAICompatibleEmbeddingProvider(EmbeddingProvider):
-    """Calls any OpenAI-compatible endpoint using the `/embeddings` contract."""
 
-    def __init__(self, base_url: str, api_key: str, model: str) -> None:
-        import httpx  # local import to avoid hard dependency during offline tests
+class _OpenAICompatibleBase:
+    """Configuration and per-attempt decisions shared by the sync and async providers.
 
+    Each attempt is: ``_throttle`` → ``_request_body`` → transport call →
+    ``_outcome`` (or ``_transport_delay``); subclasses supply only the
+    transport call and the sleep.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        model: str,
+        *,
+        timeout: float = 30.0,
+        max_batch_items: int = 256,
+        max_batch_tokens: int = 100_000,
+        tokenizer: Optional[Tokenizer] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        encoding_format: str = "base64",
+        dimensions: Optional[int] = None,
+        truncate_locally: bool = False,
+    ) -> None:
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.model = model
-        self._client = httpx.Client(base_url=self.base_url, headers={"Authorization": f"Bearer {api_key}"})
-        
-    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        self.timeout = timeout
+        self.max_batch_items = max_batch_items
+        self.max_batch_tokens = max_batch_tokens
+        self.tokenizer = tokenizer or HeuristicTokenizer()
+        self.rate_limiter = rate_limiter
+        self.retry = retry or RetryPolicy()
+        self.encoding_format = encoding_format
+        self.dimensions = dimensions
+        self.truncate_locally = truncate_locally
+        self.last_call = EmbeddingCallStats()
+        self.stats = EmbeddingCallStats()
+
+    @property
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    def _begin_call(self, texts: Sequence[str]) -> Tuple[EmbeddingCallStats, List[int]]:
+        call = EmbeddingCallStats(texts=len(texts))
+        token_counts = [self.tokenizer.count_tokens(text) for text in texts]
+        call.estimated_tokens = sum(token_counts)
+        return call, token_counts
+
+    def _finish_call(self, call: EmbeddingCallStats, started: float, matrix: Optional[np.ndarray]) -> np.ndarray:
+        if matrix is None:
+            matrix = np.empty((0, 0), dtype=np.float32)
+        matrix = truncate_embeddings(matrix, self.dimensions)
+        call.seconds = time.perf_counter() - started
+        self.last_call = call
+        self.stats.add(call)
+        return matrix
+
+    def _throttle(self, tokens: int, call: EmbeddingCallStats) -> float:
+        """Seconds to wait before sending ``tokens`` under the rate limiter."""
+
+        wait = self.rate_limiter.reserve(tokens) if self.rate_limiter is not None else 0.0
+        if wait > 0:
+            call.waited_seconds += wait
+        return wait
+
+    def _request_body(self, inputs: List[str]) -> Tuple[str, dict]:
+        encoding_format = self.encoding_format
+        dimensions = None if self.truncate_locally else self.dimensions
+        return encoding_format, _request_body(self.model, inputs, encoding_format, dimensions)
+
+    def _transport_delay(self, attempt: int, call: EmbeddingCallStats) -> Optional[float]:
+        return _retry_delay(self.retry, self.rate_limiter, attempt, None, call)
+
+    def _outcome(
+        self, response: "httpx.Response", encoding_format: str, attempt: int, call: EmbeddingCallStats
+    ) -> Tuple[Optional[dict], float]:
+        """``(payload, 0)`` on success, else ``(None, delay)`` before the next attempt.
+
+        A zero delay resends at once (after the base64 fallback); errors that
+        are not retryable, or out of retries, are raised.
+        """
+
+        if _rejects_base64(response, encoding_format):
+            # Concurrent async batches may all hit this; each resends as floats.
+            self.encoding_format = "float"
+            return None, 0.0
+        if response.status_code not in RETRYABLE_STATUSES:
+            response.raise_for_status()
+            return response.json(), 0.0
+        delay = _retry_delay(self.retry, self.rate_limiter, attempt, response, call)
+        if delay is None:
+            response.raise_for_status()
+        return None, delay
+
+
+class OpenAICompatibleEmbeddingProvider(_OpenAICompatibleBase, EmbeddingProvider):
+    """Calls any OpenAI-compatible endpoint using the `/embeddings` contract.
+
+    Inputs are split into requests of at most ``max_batch_items`` texts and
+    ``max_batch_tokens`` estimated tokens; rows come back in input order.
+    Each request waits on the optional ``rate_limiter`` and retries 429, 5xx
+    and transport errors per ``retry``. ``last_call`` and ``stats`` report
+    requests, tokens, retries and throttling per call and in total.
+
+    Vectors are requested as base64 float32 by default, which is several
+    times cheaper to parse than JSON floats; if the endpoint rejects
+    ``encoding_format`` (a 400/422 whose body names it) the provider
+    switches to ``"float"`` for good.
+
+    ``dimensions`` is sent as the request parameter, or with
+    ``truncate_locally`` applied client-side via ``truncate_embeddings`` for
+    models that do not accept it. Pass ``http`` to share connection pools
+    with the other adapters.
+    """
+
+    def __init__(self, base_url: str, api_key: str, model: str, *, http: Optional[HTTPClientFactory] = None, **options) -> None:
+        super().__init__(base_url, api_key, model, **options)
+        self._client = build_client(http, self.base_url, headers=self._headers)
+
+    def _embed_unique(self, texts: Sequence[str]) -> np.ndarray:
+        started = time.perf_counter()
+        call, token_counts = self._begin_call(texts)
+        matrix: Optional[np.ndarray] = None
+        for batch in plan_batches(token_counts, self.max_batch_items, self.max_batch_tokens):
+            inputs = [texts[position] for position in batch]
+            payload = self._post(inputs, sum(token_counts[position] for position in batch), call)
+            matrix = _store_response(matrix, batch, payload, len(texts), call)
+        return self._finish_call(call, started, matrix)
+
+    def _post(self, inputs: List[str], tokens: int, call: EmbeddingCallStats) -> dict:
         import httpx
 
-        response = self._client.post(
-            "/v1/embeddings",
-            json={"model": self.model, "input": list(texts)},
-            timeout=30,
-        )
-        response.raise_for_status()
-        payload = response.json()
-        return [item["embedding"] for item in payload["data"]]
+        for attempt in itertools.count():
+            wait = self._throttle(tokens, call)
+            if wait > 0:
+                time.sleep(wait)
+            encoding_format, body = self._request_body(inputs)
+            try:
+                response = self._client.post("/v1/embeddings", json=body, timeout=self.timeout)
+            except httpx.TransportError:
+                delay = self._transport_delay(attempt, call)
+                if delay is None:
+                    raise
+            else:
+                payload, delay = self._outcome(response, encoding_format, attempt, call)
+                if payload is not None:
+                    return payload
+            if delay > 0:
+                time.sleep(delay)
 
     def close(self) -> None:
         self._client.close()
 
 
+class QueryEmbeddingCache:
+    """Bounded LRU of query vectors with a time-to-live.
+
+    Share one instance between the retriever and the reranker so a user
+    query costs at most one embedding round-trip, and repeated queries none.
+    """
+
+    def __init__(self, provider: EmbeddingProvider, maxsize: int = 1024, ttl_seconds: float = 3600.0) -> None:
+        self.provider = provider
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._vectors: "OrderedDict[str, Tuple[float, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def embed_query(self, query: str) -> np.ndarray:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._vectors.get(query)
+            if entry is not None and entry[0] > now:
+                self._vectors.move_to_end(query)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        vector = self.provider.embed([query])[0]
+        vector.setflags(write=False)
+        with self._lock:
+            self._vectors[query] = (now + self.ttl_seconds, vector)
+            self._vectors.move_to_end(query)
+            while len(self._vectors) > self.maxsize:
+                self._vectors.popitem(last=False)
+        return vector
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors.clear()
+
+
+class AsyncEmbeddingProvider(ABC):
+    """Asynchronous counterpart of ``EmbeddingProvider`` with the same matrix contract."""
+
+    @abstractmethod
+    async def aembed(self, texts: Sequence[str]) -> np.ndarray:
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        return None
+
+
+class AsyncOpenAICompatibleEmbeddingProvider(_OpenAICompatibleBase, AsyncEmbeddingProvider):
+    """OpenAI-compatible embeddings over ``httpx.AsyncClient``.
+
+    A call is split like the sync provider's, but into at least
+    ``concurrency`` requests when there are enough texts, and up to
+    ``concurrency`` requests are in flight at once. Retries, throttling, the
+    base64 fallback and ``dimensions`` behave as in
+    ``OpenAICompatibleEmbeddingProvider``.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        model: str,
+        *,
+        concurrency: int = 4,
+        http: Optional[HTTPClientFactory] = None,
+        **options,
+    ) -> None:
+        super().__init__(base_url, api_key, model, **options)
+        self.concurrency = max(1, concurrency)
+        self._client = build_async_client(http, self.base_url, headers=self._headers)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def aembed(self, texts: Sequence[str]) -> np.ndarray:
+        started = time.perf_counter()
+        call, token_counts = self._begin_call(texts)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        max_items = min(self.max_batch_items, -(-len(texts) // self.concurrency))
+        batches = plan_batches(token_counts, max_items, self.max_batch_tokens)
+        payloads = await asyncio.gather(
+            *(
+                self._post(
+                    [texts[position] for position in batch],
+                    sum(token_counts[position] for position in batch),
+                    call,
+                )
+                for batch in batches
+            )
+        )
+        matrix: Optional[np.ndarray] = None
+        for batch, payload in zip(batches, payloads):
+            matrix = _store_response(matrix, batch, payload, len(texts), call)
+        return self._finish_call(call, started, matrix)
+
+    async def _post(self, inputs: List[str], tokens: int, call: EmbeddingCallStats) -> dict:
+        import httpx
+
+        for attempt in itertools.count():
+            # Throttle outside the semaphore so waiting batches do not hold a slot.
+            wait = self._throttle(tokens, call)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            encoding_format, body = self._request_body(inputs)
+            try:
+                async with self._semaphore:
+                    response = await self._client.post("/v1/embeddings", json=body, timeout=self.timeout)
+            except httpx.TransportError:
+                delay = self._transport_delay(attempt, call)
+                if delay is None:
+                    raise
+            else:
+                payload, delay = self._outcome(response, encoding_format, attempt, call)
+                if payload is not None:
+                    return payload
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class SyncEmbeddingProvider(EmbeddingProvider):
+    """Runs an ``AsyncEmbeddingProvider`` on a private event loop thread.
+
+    Lets synchronous callers (the CLI, ``EmbeddingSimilarityReranker``) use
+    an async provider unchanged, including from code that already runs an
+    event loop.
+    """
+
+    def __init__(self, provider: AsyncEmbeddingProvider) -> None:
+        self.provider = provider
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="embedding-loop", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def stats(self) -> Optional[EmbeddingCallStats]:
+        return getattr(self.provider, "stats", None)
+
+    def _embed_unique(self, texts: Sequence[str]) -> np.ndarray:
+        return asyncio.run_coroutine_threadsafe(self.provider.aembed(texts), self._loop).result()
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self.provider.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
 __all__ = [
+    "AsyncEmbeddingProvider",
+    "AsyncOpenAICompatibleEmbeddingProvider",
+    "EmbeddingCallStats",
     "EmbeddingProvider",
+    "as_embedding_matrix",
+    "plan_batches",
     "MockEmbeddingProvider",
     "OpenAICompatibleEmbeddingProvider",
+    "QueryEmbeddingCache",
+    "SyncEmbeddingProvider",
+    "truncate_embeddings",
 ]
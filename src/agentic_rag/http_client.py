@@ -0,0 +1,124 @@
+"""Shared, pooled HTTP clients for the embedding, indexing and search adapters."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from .config import HTTPSettings
+
+if TYPE_CHECKING:  # pragma: no cover
+    import httpx
+
+
+class _SharedTransport:
+    """Forwards to a pooled transport but leaves closing it to the factory."""
+
+    def __init__(self, transport: "httpx.HTTPTransport") -> None:
+        self._transport = transport
+
+    def handle_request(self, request: "httpx.Request") -> "httpx.Response":
+        return self._transport.handle_request(request)
+
+    def __enter__(self) -> "_SharedTransport":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+class HTTPClientFactory:
+    """Hands out ``httpx`` clients that draw from one set of keep-alive pools.
+
+    Each client keeps its own base URL, headers and timeout, but connections
+    come from a shared pool (plus a dedicated pool per host listed in
+    ``per_host_max_connections``), so adapters talking to the same host reuse
+    TCP/TLS connections. Closing a client leaves the pools open; ``close`` on
+    the factory releases them. Async clients get the same limits but own
+    their pool, which is bound to the event loop that uses it.
+    """
+
+    def __init__(self, settings: Optional[HTTPSettings] = None) -> None:
+        self.settings = settings or HTTPSettings()
+        self._pools: Optional[Tuple[Any, Dict[str, Any]]] = None
+
+    def _limits(self, max_connections: Optional[int] = None) -> "httpx.Limits":
+        import httpx
+
+        settings = self.settings
+        max_connections = max_connections or settings.max_connections
+        return httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(max_connections, settings.max_keepalive_connections),
+            keepalive_expiry=settings.keepalive_expiry,
+        )
+
+    def _transports(self, transport_type: type) -> Tuple[Any, Dict[str, Any]]:
+        if self.settings.http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError as exc:
+                raise RuntimeError(
+                    "http.http2 requires the h2 package. Install httpx[http2] or disable http2."
+                ) from exc
+        http2 = self.settings.http2
+        default = transport_type(limits=self._limits(), http2=http2)
+        mounts = {
+            f"all://{host}": transport_type(limits=self._limits(limit), http2=http2)
+            for host, limit in self.settings.per_host_max_connections.items()
+        }
+        return default, mounts
+
+    def client(self, base_url: str, **options: Any) -> "httpx.Client":
+        """A client over the shared pools; ``options`` go to ``httpx.Client``."""
+
+        import httpx
+
+        if self._pools is None:
+            self._pools = self._transports(httpx.HTTPTransport)
+        default, mounts = self._pools
+        return httpx.Client(
+            base_url=base_url,
+            transport=_SharedTransport(default),
+            mounts={pattern: _SharedTransport(transport) for pattern, transport in mounts.items()},
+            **options,
+        )
+
+    def async_client(self, base_url: str, **options: Any) -> "httpx.AsyncClient":
+        import httpx
+
+        default, mounts = self._transports(httpx.AsyncHTTPTransport)
+        return httpx.AsyncClient(base_url=base_url, transport=default, mounts=mounts, **options)
+
+    def close(self) -> None:
+        if self._pools is None:
+            return
+        default, mounts = self._pools
+        self._pools = None
+        default.close()
+        for transport in mounts.values():
+            transport.close()
+
+
+def build_client(http: Optional[HTTPClientFactory], base_url: str, **options: Any) -> "httpx.Client":
+    """Client from ``http`` when a factory is injected, else a standalone one."""
+
+    if http is not None:
+        return http.client(base_url, **options)
+    import httpx
+
+    return httpx.Client(base_url=base_url, **options)
+
+
+def build_async_client(
+    http: Optional[HTTPClientFactory], base_url: str, **options: Any
+) -> "httpx.AsyncClient":
+    if http is not None:
+        return http.async_client(base_url, **options)
+    import httpx
+
+    return httpx.AsyncClient(base_url=base_url, **options)
+
+
+__all__ = ["HTTPClientFactory", "build_async_client", "build_client"]
@@ -3,27 +3,46 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, List, Optional, Union
 
-from .models import EmbeddedChunk
+from .embeddings import truncate_embeddings
+from .http_client import HTTPClientFactory, build_client
+from .models import ChunkBatch, EmbeddedChunk
+
+UploadPayload = Union[Iterable[EmbeddedChunk], ChunkBatch]
 
 
 class AzureSearchIndexer:
-    """Minimal client to push chunks into Azure AI Search."""
+    """Minimal client to push chunks into Azure AI Search.
 
-    def __init__(self, endpoint: str, api_key: str, index_name: str) -> None:
-        import httpx
+    With ``dimensions`` set, longer vectors are truncated and renormalized to
+    the index field's size before upload. Pass ``http`` to share connection
+    pools with the other adapters.
+    """
 
+    def __init__(
+        self,
+        endpoint: str,
+        api_key: str,
+        index_name: str,
+        *,
+        dimensions: Optional[int] = None,
+        http: Optional[HTTPClientFactory] = None,
+    ) -> None:
         self.endpoint = endpoint.rstrip("/")
         self.index_name = index_name
-        self._client = httpx.Client(
-            base_url=self.endpoint,
+        self.dimensions = dimensions
+        self._client = build_client(
+            http,
+            self.endpoint,
             headers={"Content-Type": "application/json", "api-key": api_key},
         )
 
-    def upload(self, chunks: Iterable[EmbeddedChunk]) -> None:
+    def upload(self, chunks: UploadPayload) -> None:
         import httpx
 
+        if isinstance(chunks, ChunkBatch):
+            chunks = chunks.iter_embedded_chunks()
         actions = [
             {
                 "@search.action": "mergeOrUpload",
@@ -31,7 +50,7 @@ class AzureSearchIndexer:
                 "doc_id": chunk.doc_id,
                 "rev": chunk.rev,
                 "text": chunk.text,
-                "embedding_vector": chunk.embedding,
+                "embedding_vector": truncate_embeddings(chunk.embedding, self.dimensions).tolist(),
                 "page_start": chunk.page_start,
                 "page_end": chunk.page_end,
                 "section_path": chunk.section_path,
@@ -54,11 +73,14 @@ class AzureSearchIndexer:
 class JSONLIndexer:
     """Writes chunks to disk for offline inspection or handoff to other systems."""
 
-    def __init__(self, output_path: Path) -> None:
+    def __init__(self, output_path: Path, *, dimensions: Optional[int] = None) -> None:
         self.output_path = output_path
+        self.dimensions = dimensions
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    def upload(self, chunks: Iterable[EmbeddedChunk]) -> None:
+    def upload(self, chunks: UploadPayload) -> None:
+        if isinstance(chunks, ChunkBatch):
+            chunks = chunks.iter_embedded_chunks()
         with self.output_path.open("a", encoding="utf-8") as f:
             for chunk in chunks:
                 record = {
@@ -66,7 +88,8 @@ class JSONLIndexer:
                     "doc_id": chunk.doc_id,
                     "rev": chunk.rev,
                     "text": chunk.text,
-                    "embedding": chunk.embedding,
+                    "embedding": truncate_embeddings(chunk.embedding, self.dimensions).tolist(),
+                    "embedding_model": chunk.embedding_model,
                     "meta": chunk.metadata,
                 }
                 f.write(json.dumps(record) + "\n")
@@ -0,0 +1,365 @@
+"""Batch ingestion helpers shared by the single-document and bulk CLI commands."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .boilerplate import BoilerplateFilter, BoilerplateReport
+from .chunking import ChunkingConfig, chunk_document
+from .embeddings import EmbeddingProvider, truncate_embeddings
+from .loading import NDJSONCorpus, load_revision, parse_revision
+from .models import Chunk, ChunkBatch, DocumentRevision
+
+
+@dataclass(slots=True)
+class IngestStats:
+    """Counters reported at the end of a bulk ingest run."""
+
+    documents: int = 0
+    chunks: int = 0
+    boilerplate_tokens_removed: int = 0
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return max(time.perf_counter() - self.started_at, 1e-9)
+
+    def summary(self) -> str:
+        summary = (
+            f"{self.documents} documents, {self.chunks} chunks, {len(self.failed)} failed "
+            f"in {self.elapsed:.1f}s ({self.documents / self.elapsed:.1f} docs/s, "
+            f"{self.chunks / self.elapsed:.1f} chunks/s)"
+        )
+        if self.boilerplate_tokens_removed:
+            summary += f", {self.boilerplate_tokens_removed} boilerplate tokens stripped"
+        return summary
+
+
+@dataclass(slots=True)
+class ChunkedDocument:
+    """Outcome of chunking one document in the bulk pipeline."""
+
+    path: Path
+    chunks: List[Chunk] = field(default_factory=list)
+    boilerplate: Optional[BoilerplateReport] = None
+    error: Optional[str] = None
+    record: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.path}{self.record}" if self.record else str(self.path)
+
+
+def read_manifest(manifest_path: Path) -> List[Path]:
+    """Read one document path per line; relative paths resolve against the manifest."""
+
+    paths: List[Path] = []
+    for line in manifest_path.read_text(encoding="utf-8").splitlines():
+        entry = line.strip()
+        if not entry or entry.startswith("#"):
+            continue
+        path = Path(entry)
+        paths.append(path if path.is_absolute() else manifest_path.parent / path)
+    return paths
+
+
+def discover_documents(directory: Path, pattern: str = "*.json", recursive: bool = False) -> List[Path]:
+    matches = directory.rglob(pattern) if recursive else directory.glob(pattern)
+    return sorted(path for path in matches if path.is_file())
+
+
+def chunk_revision(
+    document: DocumentRevision,
+    config: ChunkingConfig,
+    boilerplate: Optional[BoilerplateFilter] = None,
+    **kwargs,
+) -> Tuple[List[Chunk], Optional[BoilerplateReport]]:
+    """Strip boilerplate (when a filter is given) and chunk one revision."""
+
+    report = None
+    if boilerplate is not None:
+        blocks, report = boilerplate.strip(document.blocks)
+        document.blocks = blocks
+    return chunk_document(document, config, **kwargs), report
+
+
+# Set once per worker process by ``_init_worker`` so tasks carry only paths or
+# offsets, and the tokenizer's count cache survives across a worker's documents.
+_worker_config: Optional[ChunkingConfig] = None
+_worker_boilerplate: Optional[BoilerplateFilter] = None
+
+
+def _init_worker(config: ChunkingConfig, boilerplate: Optional[BoilerplateFilter]) -> None:
+    global _worker_config, _worker_boilerplate
+    _worker_config = config
+    _worker_boilerplate = boilerplate
+
+
+def _chunk_path(path: Path, config: ChunkingConfig, boilerplate: Optional[BoilerplateFilter]) -> ChunkedDocument:
+    chunks, report = chunk_revision(load_revision(path), config, boilerplate)
+    return ChunkedDocument(path, chunks, report)
+
+
+def _chunk_path_task(path: Path) -> ChunkedDocument:
+    # Module-level so it can be pickled into worker processes.
+    return _chunk_path(path, _worker_config, _worker_boilerplate)
+
+
+def iter_chunked_documents(
+    paths: Sequence[Path],
+    config: ChunkingConfig,
+    *,
+    workers: int = 1,
+    boilerplate: Optional[BoilerplateFilter] = None,
+) -> Iterator[ChunkedDocument]:
+    """Chunk documents across a process pool.
+
+    Results arrive in completion order; failures are returned with ``error``
+    set instead of raising. At most ``workers * 2`` documents are in flight so
+    a slow embed/upload stage applies back-pressure to chunking.
+    """
+
+    if workers <= 1:
+        for path in paths:
+            try:
+                yield _chunk_path(path, config, boilerplate)
+            except Exception as exc:  # noqa: BLE001 - reported per document
+                yield ChunkedDocument(path, error=f"{type(exc).__name__}: {exc}")
+        return
+
+    pending_paths = iter(paths)
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(config, boilerplate)
+    ) as executor:
+        in_flight: dict[Future, Path] = {}
+
+        def submit(count: int) -> None:
+            for path in islice(pending_paths, count):
+                in_flight[executor.submit(_chunk_path_task, path)] = path
+
+        submit(workers * 2)
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = in_flight.pop(future)
+                exc = future.exception()
+                if exc is None:
+                    yield future.result()
+                else:
+                    yield ChunkedDocument(path, error=f"{type(exc).__name__}: {exc}")
+            submit(len(done))
+
+
+def _chunk_corpus_range(
+    path: Path,
+    start: int,
+    stop: int,
+    config: ChunkingConfig,
+    boilerplate: Optional[BoilerplateFilter],
+) -> List[ChunkedDocument]:
+    results: List[ChunkedDocument] = []
+    with NDJSONCorpus(path) as corpus:
+        for offset, line in corpus.iter_records(start, stop):
+            try:
+                document = parse_revision(line)
+                chunks, report = chunk_revision(document, config, boilerplate)
+                record = f"#{document.doc_id}@{document.rev}"
+            except Exception as exc:  # noqa: BLE001 - reported per record
+                results.append(
+                    ChunkedDocument(path, error=f"{type(exc).__name__}: {exc}", record=f"@{offset}")
+                )
+                continue
+            results.append(ChunkedDocument(path, chunks, report, record=record))
+    return results
+
+
+def _chunk_corpus_range_task(path: Path, start: int, stop: int) -> List[ChunkedDocument]:
+    return _chunk_corpus_range(path, start, stop, _worker_config, _worker_boilerplate)
+
+
+def iter_chunked_corpus(
+    path: Path,
+    config: ChunkingConfig,
+    *,
+    workers: int = 1,
+    boilerplate: Optional[BoilerplateFilter] = None,
+    range_bytes: int = 8 << 20,
+) -> Iterator[ChunkedDocument]:
+    """Chunk every revision of an NDJSON corpus, one byte range per task.
+
+    Each worker maps the file itself and reads only its range, so nothing is
+    pickled but offsets. Ranges of about ``range_bytes`` keep per-task results
+    small; at most ``workers * 2`` ranges are in flight.
+    """
+
+    with NDJSONCorpus(path) as corpus:
+        parts = max(workers, -(-corpus.size // range_bytes))
+        ranges = corpus.byte_ranges(parts)
+    if workers <= 1:
+        for start, stop in ranges:
+            yield from _chunk_corpus_range(path, start, stop, config, boilerplate)
+        return
+
+    pending_ranges = iter(ranges)
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(config, boilerplate)
+    ) as executor:
+        in_flight: dict[Future, Tuple[int, int]] = {}
+
+        def submit(count: int) -> None:
+            for start, stop in islice(pending_ranges, count):
+                future = executor.submit(_chunk_corpus_range_task, path, start, stop)
+                in_flight[future] = (start, stop)
+
+        submit(workers * 2)
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                start, stop = in_flight.pop(future)
+                exc = future.exception()
+                if exc is None:
+                    yield from future.result()
+                else:
+                    yield ChunkedDocument(
+                        path, error=f"{type(exc).__name__}: {exc}", record=f"@{start}-{stop}"
+                    )
+            submit(len(done))
+
+
+class EmbeddingReuse:
+    """Vectors from a previous revision's chunks, keyed by a hash of the chunk text.
+
+    Chunking is deterministic, so spans that did not change between revisions
+    produce byte-identical chunk texts and can keep their stored vectors.
+    """
+
+    def __init__(self, vectors: Dict[bytes, np.ndarray], embedding_model: Optional[str] = None) -> None:
+        self._vectors = vectors
+        self.embedding_model = embedding_model
+        self.reused = 0
+        self.embedded = 0
+
+    @classmethod
+    def from_jsonl(
+        cls,
+        path: Path,
+        *,
+        doc_id: Optional[str] = None,
+        embedding_model: Optional[str] = None,
+        dimensions: Optional[int] = None,
+    ) -> "EmbeddingReuse":
+        """Load vectors from a ``JSONLIndexer`` export.
+
+        Records for other documents, or embedded with a different model, are
+        skipped. Exports written before ``embedding_model`` was recorded are
+        trusted as-is. With ``dimensions``, longer vectors are truncated to
+        match fresh ones and shorter ones are skipped.
+        """
+
+        vectors: Dict[bytes, np.ndarray] = {}
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if doc_id is not None and record.get("doc_id") != doc_id:
+                    continue
+                model = record.get("embedding_model")
+                if embedding_model and model and model != embedding_model:
+                    continue
+                if not record.get("embedding"):
+                    continue
+                vector = np.asarray(record["embedding"], dtype=np.float32)
+                if dimensions and len(vector) < dimensions:
+                    continue
+                vectors[_text_key(record["text"])] = truncate_embeddings(vector, dimensions)
+        return cls(vectors, embedding_model)
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def lookup(self, text: str) -> Optional[np.ndarray]:
+        return self._vectors.get(_text_key(text))
+
+    def summary(self) -> str:
+        total = self.reused + self.embedded
+        ratio = self.reused / total if total else 0.0
+        return f"Reused {self.reused}/{total} embeddings from the previous revision ({ratio:.0%} saved)"
+
+
+def _text_key(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+def embed_chunks(
+    chunks: Sequence[Chunk],
+    provider: EmbeddingProvider,
+    embedding_model: Optional[str],
+    reuse: Optional[EmbeddingReuse] = None,
+) -> ChunkBatch:
+    """Embed chunks into a columnar batch, taking vectors from ``reuse`` for unchanged texts."""
+
+    batch = ChunkBatch.from_chunks(chunks)
+    if not chunks:
+        return batch
+    vectors: List[Optional[np.ndarray]] = [None] * len(chunks)
+    if reuse is not None:
+        for position, chunk in enumerate(chunks):
+            vectors[position] = reuse.lookup(chunk.text)
+    missing = [position for position, vector in enumerate(vectors) if vector is None]
+    if not missing and len({len(vector) for vector in vectors}) > 1:
+        missing = list(range(len(chunks)))
+    if len(missing) == len(chunks):
+        matrix = provider.embed([chunk.text for chunk in chunks])
+    else:
+        if missing:
+            fresh = provider.embed([chunks[position].text for position in missing])
+            for position, vector in zip(missing, fresh):
+                vectors[position] = vector
+            # A stored vector of another width came from a different model or
+            # dimension setting; embed its chunk afresh rather than mixing shapes.
+            stale = [position for position, vector in enumerate(vectors) if len(vector) != fresh.shape[1]]
+            if stale:
+                for position, vector in zip(stale, provider.embed([chunks[position].text for position in stale])):
+                    vectors[position] = vector
+                missing.extend(stale)
+        matrix = np.stack(vectors)
+    if reuse is not None:
+        reuse.embedded += len(missing)
+        reuse.reused += len(chunks) - len(missing)
+    return batch.with_embeddings(matrix, embedding_model)
+
+
+def batched(chunks: Iterable[Chunk], size: int) -> Iterator[List[Chunk]]:
+    iterator = iter(chunks)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def default_worker_count() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+__all__ = [
+    "ChunkedDocument",
+    "EmbeddingReuse",
+    "IngestStats",
+    "batched",
+    "chunk_revision",
+    "default_worker_count",
+    "discover_documents",
+    "embed_chunks",
+    "iter_chunked_corpus",
+    "iter_chunked_documents",
+    "read_manifest",
+]
@@ -0,0 +1,402 @@
+"""Loaders for normalized document JSON, including a streaming block reader."""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+from dataclasses import fields
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from .models import DocumentBlock, DocumentRevision
+
+try:  # Optional fast backend; the stdlib parser is always available.
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    _orjson = None
+
+_loads = _orjson.loads if _orjson is not None else json.loads
+
+_READ_SIZE = 1 << 20
+_SKIP_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_END = frozenset(",]}: \t\n\r")
+
+# Revision fields the chunker reads. Once these have been parsed, blocks can
+# be streamed straight from the first pass over the file.
+_STREAM_HEADER_KEYS = ("doc_id", "rev", "title", "allowed_groups", "source_url")
+_HEADER_FIELDS = frozenset(field.name for field in fields(DocumentRevision)) - {"blocks"}
+
+
+def json_backend() -> str:
+    """Name of the backend used by ``load_revision``."""
+
+    return "orjson" if _orjson is not None else "json"
+
+
+def load_revision(path: Path) -> DocumentRevision:
+    """Parse a whole normalized document, using orjson when it is installed."""
+
+    if _orjson is not None:
+        return parse_revision(path.read_bytes())
+    return DocumentRevision.from_json(path)
+
+
+def parse_revision(data: bytes) -> DocumentRevision:
+    """Parse one serialized revision (a file body or an NDJSON line)."""
+
+    return DocumentRevision.from_dict(_loads(data))
+
+
+class _JSONReader:
+    """Pull parser over a text stream built on ``JSONDecoder.raw_decode``.
+
+    Values are decoded by the C scanner one at a time, so memory is bounded by
+    the largest single value (one block) plus the read buffer.
+    """
+
+    def __init__(self, handle: TextIO, read_size: int = _READ_SIZE) -> None:
+        self._handle = handle
+        self._read_size = read_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        # Grow reads with the pending value so a huge block is not re-scanned
+        # once per ``read_size``.
+        data = self._handle.read(max(self._read_size, len(self._buffer) - self._pos))
+        if not data:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + data
+        self._pos = 0
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buffer, self._pos)
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or ``""`` at end of input."""
+
+        while True:
+            self._pos = _SKIP_WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self._error(f"Expecting {char!r}")
+        self._pos += 1
+
+    def value(self) -> object:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number cut by the buffer edge ("1." or "2e-") decodes as its
+            # prefix; read on unless a delimiter shows it really ended.
+            if (
+                type(value) in (int, float)
+                and (end == len(self._buffer) or self._buffer[end] not in _NUMBER_END)
+                and self._fill()
+            ):
+                continue
+            self._pos = end
+            return value
+
+    def members(self) -> Iterator[str]:
+        """Yield the keys of an object; the caller consumes each value before resuming."""
+
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise self._error("Expecting property name")
+            self.expect(":")
+            yield key
+            separator = self.peek()
+            self._pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise self._error("Expecting ',' delimiter")
+
+    def items(self) -> Iterator[object]:
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise self._error("Expecting ',' delimiter")
+
+
+def stream_revision(path: Path) -> Tuple[DocumentRevision, Iterator[DocumentBlock]]:
+    """Parse the revision header and return it with a lazy iterator over its blocks.
+
+    The returned revision has an empty ``blocks`` list; pass it as ``doc`` to
+    ``iter_chunks`` together with the iterator. Files that put the header
+    fields before ``blocks`` (as the normalizer does) are read in one pass and
+    any trailing fields are applied once the iterator is exhausted. Otherwise
+    the header is collected first and blocks are streamed from a second pass.
+    The iterator must be consumed (or closed) to release the file handle.
+    """
+
+    handle = path.open("r", encoding="utf-8")
+    try:
+        reader = _JSONReader(handle)
+        members = reader.members()
+        payload: Dict[str, object] = {}
+        for key in members:
+            if key == "blocks":
+                break
+            payload[key] = reader.value()
+        else:
+            handle.close()
+            return DocumentRevision.from_dict(payload, blocks=[]), iter(())
+
+        if all(key in payload for key in _STREAM_HEADER_KEYS):
+            document = DocumentRevision.from_dict(payload, blocks=[])
+            return document, _stream_blocks(handle, reader, members, document)
+
+        for _ in reader.items():
+            pass
+        for key in members:
+            payload[key] = reader.value()
+    except BaseException:
+        handle.close()
+        raise
+    handle.close()
+    return DocumentRevision.from_dict(payload, blocks=[]), _reopen_blocks(path)
+
+
+def _stream_blocks(
+    handle: TextIO, reader: _JSONReader, members: Iterator[str], document: DocumentRevision
+) -> Iterator[DocumentBlock]:
+    with handle:
+        for item in reader.items():
+            yield DocumentBlock(**item)
+        trailing = {key: reader.value() for key in members}
+    for key, value in trailing.items():
+        if key in _HEADER_FIELDS:
+            setattr(document, key, value)
+
+
+def _reopen_blocks(path: Path) -> Iterator[DocumentBlock]:
+    with path.open("r", encoding="utf-8") as handle:
+        reader = _JSONReader(handle)
+        for key in reader.members():
+            if key != "blocks":
+                reader.value()
+                continue
+            for item in reader.items():
+                yield DocumentBlock(**item)
+            return
+
+
+_INDEX_VERSION = 1
+_COUNT_BLOCK = 8 << 20
+# Top-level ``doc_id``/``rev`` string fields, found without decoding the line.
+_KEY_FIELD = re.compile(rb'(?<!\\)"(doc_id|rev)"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+
+class NDJSONCorpus:
+    """Memory-mapped access to an NDJSON file holding one revision per line.
+
+    Iteration and byte-range reads need no index. ``get`` uses a line-offset
+    index persisted next to the file as ``<name>.idx``; it is built on first
+    use and rebuilt whenever the file's size or mtime changes. Parallel
+    workers each open the corpus and read one of ``byte_ranges(n)``: a line
+    belongs to the range that contains its first byte.
+    """
+
+    def __init__(self, path: Path, *, index_path: Optional[Path] = None) -> None:
+        self.path = path
+        self.index_path = index_path or path.with_name(path.name + ".idx")
+        self._file = path.open("rb")
+        stat = os.fstat(self._file.fileno())
+        self._stamp = (stat.st_size, stat.st_mtime_ns)
+        self._data = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+        )
+        self._offsets: Optional[List[Tuple[int, int]]] = None
+        self._keys: List[Tuple[str, str]] = []
+        self._rows: Dict[Tuple[str, str], int] = {}
+        self._latest: Dict[str, int] = {}
+
+    def __enter__(self) -> "NDJSONCorpus":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    @property
+    def size(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[DocumentRevision]:
+        return self.iter_range(0, self.size)
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def count_lines(self) -> int:
+        """Number of lines, counted without parsing or indexing them.
+
+        Blank lines are included, so this is an upper bound on ``len`` that
+        is cheap enough for progress totals.
+        """
+
+        if self._offsets is not None:
+            return len(self._offsets)
+        data = self._data
+        size = len(data)
+        count = sum(data[start : start + _COUNT_BLOCK].count(b"\n") for start in range(0, size, _COUNT_BLOCK))
+        return count + (size > 0 and data[size - 1] != 0x0A)
+
+    def keys(self) -> List[Tuple[str, str]]:
+        """``(doc_id, rev)`` of every line, in file order."""
+
+        self._index()
+        return list(self._keys)
+
+    def get(self, doc_id: str, rev: Optional[str] = None) -> DocumentRevision:
+        """Fetch one revision; without ``rev`` the last one in the file for ``doc_id``."""
+
+        self._index()
+        row = self._latest.get(doc_id) if rev is None else self._rows.get((doc_id, rev))
+        if row is None:
+            raise KeyError(f"{doc_id} Rev {rev}" if rev is not None else doc_id)
+        start, end = self._offsets[row]
+        return parse_revision(self._data[start:end])
+
+    def iter_range(self, start: int, stop: int) -> Iterator[DocumentRevision]:
+        """Yield the revisions whose line starts in ``[start, stop)``."""
+
+        for _, line in self._iter_lines(start, stop):
+            yield parse_revision(line)
+
+    def iter_records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, bytes]]:
+        """Raw ``(offset, line)`` pairs for callers that parse lazily or report offsets."""
+
+        return self._iter_lines(start, self.size if stop is None else stop)
+
+    def byte_ranges(self, parts: int) -> List[Tuple[int, int]]:
+        """Split the file into ``parts`` contiguous ranges for parallel readers."""
+
+        parts = max(1, min(parts, self.size or 1))
+        bounds = [self.size * part // parts for part in range(parts + 1)]
+        return [(bounds[part], bounds[part + 1]) for part in range(parts) if bounds[part] < bounds[part + 1]]
+
+    def _iter_lines(self, start: int, stop: int) -> Iterator[Tuple[int, bytes]]:
+        data = self._data
+        size = len(data)
+        if 0 < start < size and data[start - 1] != 0x0A:
+            newline = data.find(b"\n", start)
+            start = size if newline < 0 else newline + 1
+        while start < min(stop, size):
+            newline = data.find(b"\n", start)
+            end = size if newline < 0 else newline
+            line = data[start:end]
+            if line and not line.isspace():
+                yield start, line
+            start = end + 1
+
+    def _index(self) -> List[Tuple[int, int]]:
+        if self._offsets is None:
+            loaded = self._read_index()
+            if loaded is None:
+                loaded = self._scan()
+                self._write_index(*loaded)
+            self._offsets, self._keys = loaded
+            for row, key in enumerate(self._keys):
+                if not key[0]:
+                    continue
+                self._rows[key] = row
+                self._latest[key[0]] = row
+        return self._offsets
+
+    def _scan(self) -> Tuple[List[Tuple[int, int]], List[Tuple[str, str]]]:
+        offsets: List[Tuple[int, int]] = []
+        keys: List[Tuple[str, str]] = []
+        for start, line in self._iter_lines(0, self.size):
+            offsets.append((start, start + len(line)))
+            keys.append(_line_key(line))
+        return offsets, keys
+
+    def _read_index(self) -> Optional[Tuple[List[Tuple[int, int]], List[Tuple[str, str]]]]:
+        try:
+            payload = _loads(self.index_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        if payload.get("version") != _INDEX_VERSION or payload.get("stamp") != list(self._stamp):
+            return None
+        offsets = list(zip(payload["starts"], payload["ends"]))
+        keys = list(zip(payload["doc_ids"], payload["revs"]))
+        return offsets, keys
+
+    def _write_index(self, offsets: List[Tuple[int, int]], keys: List[Tuple[str, str]]) -> None:
+        payload = {
+            "version": _INDEX_VERSION,
+            "stamp": list(self._stamp),
+            "starts": [start for start, _ in offsets],
+            "ends": [end for _, end in offsets],
+            "doc_ids": [doc_id for doc_id, _ in keys],
+            "revs": [rev for _, rev in keys],
+        }
+        temporary = self.index_path.with_name(self.index_path.name + ".tmp")
+        try:
+            temporary.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(temporary, self.index_path)
+        except OSError:
+            # Read-only location: keep the index in memory for this process.
+            pass
+
+
+def _line_key(line: bytes) -> Tuple[str, str]:
+    """``(doc_id, rev)`` of one NDJSON line, decoding only those two strings.
+
+    The header normally precedes ``blocks``, so the search stops early; lines
+    where the fields cannot be found that way fall back to a full parse.
+    """
+
+    found: Dict[bytes, str] = {}
+    for match in _KEY_FIELD.finditer(line):
+        found.setdefault(match.group(1), _loads(match.group(2)))
+        if len(found) == 2:
+            break
+    if b"doc_id" in found:
+        return found[b"doc_id"], found.get(b"rev", "")
+    try:
+        payload = _loads(line)
+        return payload["doc_id"], payload.get("rev", "")
+    except (ValueError, KeyError, TypeError):
+        # Malformed lines stay countable but cannot be fetched by key;
+        # iteration surfaces the parse error to the caller.
+        return "", ""
+
+
+__all__ = ["NDJSONCorpus", "json_backend", "load_revision", "parse_revision", "stream_revision"]
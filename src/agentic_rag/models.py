@@ -1,13 +1,16 @@
 """Typed models shared across ingestion, chunking, and indexing."""
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 import json
 
+import numpy as np
+
 
 @dataclass(slots=True)
 class DocumentBlock:
@@ -35,8 +38,16 @@ class DocumentRevision:
 
     @classmethod
     def from_json(cls, path: Path) -> "DocumentRevision":
-        payload = json.loads(path.read_text(encoding="utf-8"))
-        blocks = [DocumentBlock(**block) for block in payload["blocks"]]
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+    @classmethod
+    def from_dict(
+        cls, payload: Dict[str, object], blocks: Optional[List[DocumentBlock]] = None
+    ) -> "DocumentRevision":
+        """Build a revision from parsed JSON; ``blocks`` overrides the payload's list."""
+
+        if blocks is None:
+            blocks = [DocumentBlock(**block) for block in payload.get("blocks", ())]
         return cls(
             doc_id=payload["doc_id"],
             rev=payload.get("rev", ""),
@@ -51,9 +62,34 @@ class DocumentRevision:
         )
 
 
+_SHARED_GROUPS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def shared_groups(groups: Iterable[str]) -> Tuple[str, ...]:
+    """Return the one shared tuple for an ACL with interned group names.
+
+    Distinct ACLs number in the dozens, so the table is never pruned.
+    """
+
+    if type(groups) is tuple:
+        cached = _SHARED_GROUPS.get(groups)
+        if cached is not None:
+            return cached
+    key = tuple(sys.intern(group) for group in groups)
+    return _SHARED_GROUPS.setdefault(key, key)
+
+
+def intern_optional(value: Optional[str]) -> Optional[str]:
+    return None if value is None else sys.intern(value)
+
+
 @dataclass(slots=True)
 class Chunk:
-    """Chunked representation ready for embedding and indexing."""
+    """Chunked representation ready for embedding and indexing.
+
+    Revision-level strings are interned and ``allowed_groups`` is a shared
+    tuple, so a large in-memory chunk cache holds one copy of each.
+    """
 
     chunk_id: str
     doc_id: str
@@ -63,19 +99,171 @@ class Chunk:
     page_end: int
     section_path: Optional[str]
     token_count: int
-    allowed_groups: List[str]
+    allowed_groups: Sequence[str]
     source_url: str
     metadata: dict = field(default_factory=dict)
 
+    def __post_init__(self) -> None:
+        self.doc_id = sys.intern(self.doc_id)
+        self.rev = sys.intern(self.rev)
+        self.source_url = sys.intern(self.source_url)
+        self.section_path = intern_optional(self.section_path)
+        self.allowed_groups = shared_groups(self.allowed_groups)
+
 
 @dataclass(slots=True)
 class EmbeddedChunk(Chunk):
     """Chunk with embedding vector attached."""
 
-    embedding: List[float] = field(default_factory=list)
+    embedding: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float32))
     embedding_model: Optional[str] = None
     embedding_created_at: datetime = field(default_factory=datetime.utcnow)
 
+    def __post_init__(self) -> None:
+        Chunk.__post_init__(self)
+        # Accept plain lists from older callers; store a float32 vector.
+        if not isinstance(self.embedding, np.ndarray) or self.embedding.dtype != np.float32:
+            self.embedding = np.asarray(self.embedding, dtype=np.float32)
+
+    @classmethod
+    def from_chunk(
+        cls, chunk: Chunk, embedding: np.ndarray, embedding_model: Optional[str] = None
+    ) -> "EmbeddedChunk":
+        values = {f.name: getattr(chunk, f.name) for f in fields(Chunk)}
+        return cls(**values, embedding=embedding, embedding_model=embedding_model)
+
+
+@dataclass(slots=True)
+class BatchDocument:
+    """Revision-level fields shared by every chunk of one document in a batch."""
+
+    doc_id: str
+    rev: str
+    source_url: str
+    allowed_groups: Tuple[str, ...]
+
+
+@dataclass(slots=True)
+class ChunkBatch:
+    """Struct-of-arrays representation of many chunks.
+
+    Per-document fields are stored once in ``documents`` and referenced by
+    ``doc_index``; numeric columns are int32 arrays and embeddings are a
+    single ``(n, dim)`` float32 matrix instead of one list per chunk.
+    """
+
+    documents: List[BatchDocument]
+    doc_index: np.ndarray
+    chunk_ids: List[str]
+    texts: List[str]
+    page_start: np.ndarray
+    page_end: np.ndarray
+    token_counts: np.ndarray
+    section_paths: List[Optional[str]]
+    metadata: List[dict]
+    embeddings: Optional[np.ndarray] = None
+    embedding_model: Optional[str] = None
+    embedding_created_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    @classmethod
+    def from_chunks(cls, chunks: Sequence[Chunk]) -> "ChunkBatch":
+        documents: List[BatchDocument] = []
+        positions: Dict[Tuple[str, str, str, Tuple[str, ...]], int] = {}
+        doc_index = np.empty(len(chunks), dtype=np.int32)
+        for row, chunk in enumerate(chunks):
+            key = (chunk.doc_id, chunk.rev, chunk.source_url, shared_groups(chunk.allowed_groups))
+            position = positions.get(key)
+            if position is None:
+                position = positions[key] = len(documents)
+                documents.append(BatchDocument(*key))
+            doc_index[row] = position
+        return cls(
+            documents=documents,
+            doc_index=doc_index,
+            chunk_ids=[chunk.chunk_id for chunk in chunks],
+            texts=[chunk.text for chunk in chunks],
+            page_start=np.fromiter((chunk.page_start for chunk in chunks), np.int32, len(chunks)),
+            page_end=np.fromiter((chunk.page_end for chunk in chunks), np.int32, len(chunks)),
+            token_counts=np.fromiter((chunk.token_count for chunk in chunks), np.int32, len(chunks)),
+            section_paths=[chunk.section_path for chunk in chunks],
+            metadata=[chunk.metadata for chunk in chunks],
+        )
+
+    @classmethod
+    def from_embedded_chunks(cls, chunks: Sequence["EmbeddedChunk"]) -> "ChunkBatch":
+        batch = cls.from_chunks(chunks)
+        if chunks:
+            batch.embeddings = np.stack([chunk.embedding for chunk in chunks])
+            batch.embedding_model = chunks[0].embedding_model
+            batch.embedding_created_at = chunks[0].embedding_created_at
+        return batch
+
+    def with_embeddings(self, embeddings: np.ndarray, embedding_model: Optional[str]) -> "ChunkBatch":
+        matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(self):
+            raise ValueError(f"Expected a ({len(self)}, dim) embedding matrix, got {matrix.shape}")
+        self.embeddings = matrix
+        self.embedding_model = embedding_model
+        self.embedding_created_at = datetime.utcnow()
+        return self
+
+    def take(self, rows: Sequence[int]) -> "ChunkBatch":
+        """Return a new batch with ``rows`` in the given order."""
+
+        index = np.asarray(rows, dtype=np.intp)
+        return ChunkBatch(
+            documents=self.documents,
+            doc_index=self.doc_index[index],
+            chunk_ids=[self.chunk_ids[row] for row in rows],
+            texts=[self.texts[row] for row in rows],
+            page_start=self.page_start[index],
+            page_end=self.page_end[index],
+            token_counts=self.token_counts[index],
+            section_paths=[self.section_paths[row] for row in rows],
+            metadata=[self.metadata[row] for row in rows],
+            embeddings=None if self.embeddings is None else self.embeddings[index],
+            embedding_model=self.embedding_model,
+            embedding_created_at=self.embedding_created_at,
+        )
+
+    def document(self, row: int) -> BatchDocument:
+        return self.documents[self.doc_index[row]]
+
+    def iter_chunks(self) -> Iterator[Chunk]:
+        for row in range(len(self)):
+            yield Chunk(**self._row_fields(row))
+
+    def iter_embedded_chunks(self) -> Iterator["EmbeddedChunk"]:
+        if self.embeddings is None:
+            raise ValueError("ChunkBatch has no embeddings attached")
+        created_at = self.embedding_created_at or datetime.utcnow()
+        for row in range(len(self)):
+            yield EmbeddedChunk(
+                **self._row_fields(row),
+                embedding=self.embeddings[row],
+                embedding_model=self.embedding_model,
+                embedding_created_at=created_at,
+            )
+
+    def _row_fields(self, row: int) -> Dict[str, object]:
+        document = self.document(row)
+        return {
+            "chunk_id": self.chunk_ids[row],
+            "doc_id": document.doc_id,
+            "rev": document.rev,
+            "text": self.texts[row],
+            "page_start": int(self.page_start[row]),
+            "page_end": int(self.page_end[row]),
+            "section_path": self.section_paths[row],
+            "token_count": int(self.token_counts[row]),
+            "allowed_groups": document.allowed_groups,
+            "source_url": document.source_url,
+            "metadata": self.metadata[row],
+        }
+
 
 def iter_text_blocks(blocks: Iterable[DocumentBlock], kinds: Optional[set[str]] = None) -> Iterable[DocumentBlock]:
     """Iterate over text-like blocks with optional filtering by kind."""
@@ -93,5 +281,9 @@ __all__ = [
     "DocumentRevision",
     "Chunk",
     "EmbeddedChunk",
+    "BatchDocument",
+    "ChunkBatch",
+    "intern_optional",
     "iter_text_blocks",
+    "shared_groups",
 ]
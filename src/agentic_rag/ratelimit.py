@@ -0,0 +1,107 @@
+"""Client-side throttling and retry policy for rate-limited HTTP endpoints."""
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+# Throttling, timeouts and transient server errors; anything else fails fast.
+RETRYABLE_STATUSES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """Refills at ``per_minute / 60`` units per second up to ``capacity``.
+
+    ``reserve`` always succeeds and lets the level go negative; the caller
+    sleeps for the returned debt. Concurrent callers therefore queue up in
+    reservation order instead of polling, and one oversized request cannot
+    block forever.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+            self._updated = now
+            self._level -= amount
+            return 0.0 if self._level >= 0 else -self._level / self.rate
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets plus a shared pause.
+
+    ``pause`` is driven by ``Retry-After`` so every request waits out a 429,
+    not only the one that received it.
+    """
+
+    def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None) -> None:
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._paused_until = 0.0
+
+    def reserve(self, tokens: int) -> float:
+        """Seconds to wait before sending a request of ``tokens`` tokens."""
+
+        wait = 0.0
+        if self.requests is not None:
+            wait = self.requests.reserve(1)
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.reserve(tokens))
+        return max(wait, self._paused_until - time.monotonic())
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+@dataclass(slots=True)
+class RetryPolicy:
+    """Jittered exponential backoff ("full jitter") that defers to ``Retry-After``."""
+
+    max_retries: int = 6
+    base_delay: float = 0.5
+    max_delay: float = 60.0
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """Seconds before retry number ``attempt + 1``, or ``None`` when retries are exhausted."""
+
+        if attempt >= self.max_retries:
+            return None
+        if retry_after is not None:
+            # Small jitter so clients released together do not retry in lockstep.
+            return min(retry_after, self.max_delay) + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds requested by ``retry-after-ms`` or ``Retry-After`` (delta or HTTP date)."""
+
+    milliseconds = headers.get("retry-after-ms")
+    if milliseconds:
+        try:
+            return max(0.0, float(milliseconds) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+__all__ = ["RETRYABLE_STATUSES", "RateLimiter", "RetryPolicy", "TokenBucket", "parse_retry_after"]
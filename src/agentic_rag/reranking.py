@@ -1,11 +1,13 @@
 """Lightweight reranker implementations."""
 from __future__ import annotations
 
-import math
 from dataclasses import dataclass
-from typing import Iterable, List, Protocol, Sequence
+from typing import Iterable, List, Optional, Protocol, Sequence
 
-from .embeddings import EmbeddingProvider
+import numpy as np
+
+from .embeddings import EmbeddingProvider, QueryEmbeddingCache
+from .models import ChunkBatch
 from .retrieval import SearchResult
 
 
@@ -18,32 +20,57 @@ class Reranker(Protocol):
 
 @dataclass
 class EmbeddingSimilarityReranker:
-    """Uses cosine similarity between fresh embeddings to re-order hits."""
+    """Uses cosine similarity between fresh embeddings to re-order hits.
+
+    With a ``query_cache`` (normally the retriever's) the query vector is
+    reused instead of being embedded again.
+    """
 
     embedding_provider: EmbeddingProvider
+    query_cache: Optional[QueryEmbeddingCache] = None
 
     def rerank(self, query: str, candidates: Sequence[SearchResult], top_n: int) -> List[SearchResult]:
         if not candidates:
             return []
-        texts = [query] + [candidate.text for candidate in candidates]
-        vectors = self.embedding_provider.embed(texts)
-        query_vector = vectors[0]
-        doc_vectors = vectors[1:]
-        scored: List[tuple[float, SearchResult]] = []
-        for candidate, vector in zip(candidates, doc_vectors):
-            scored.append((_cosine_similarity(query_vector, vector), candidate))
-        scored.sort(key=lambda item: item[0], reverse=True)
-        reranked = [candidate for _, candidate in scored[:top_n]]
-        return reranked
-
-
-def _cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = math.sqrt(sum(x * x for x in a))
-    norm_b = math.sqrt(sum(y * y for y in b))
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
+        texts = [candidate.text for candidate in candidates]
+        if self.query_cache is not None:
+            query_vector = self.query_cache.embed_query(query)
+            doc_matrix = self.embedding_provider.embed(texts)
+        else:
+            vectors = self.embedding_provider.embed([query] + texts)
+            query_vector, doc_matrix = vectors[0], vectors[1:]
+        scores = _cosine_similarities(query_vector, doc_matrix)
+        order = np.argsort(-scores, kind="stable")[:top_n]
+        return [candidates[position] for position in order]
+
+    def rerank_batch(self, query: str, batch: ChunkBatch, top_n: int) -> ChunkBatch:
+        """Rerank a columnar batch, reusing its stored embeddings when present."""
+
+        if not len(batch):
+            return batch
+        if batch.embeddings is not None:
+            query_vector = self._embed_query(query)
+            doc_matrix = batch.embeddings
+        elif self.query_cache is not None:
+            query_vector = self.query_cache.embed_query(query)
+            doc_matrix = self.embedding_provider.embed(batch.texts)
+        else:
+            vectors = self.embedding_provider.embed([query] + batch.texts)
+            query_vector, doc_matrix = vectors[0], vectors[1:]
+        scores = _cosine_similarities(query_vector, doc_matrix)
+        order = np.argsort(-scores, kind="stable")[:top_n]
+        return batch.take(order.tolist())
+
+    def _embed_query(self, query: str) -> np.ndarray:
+        if self.query_cache is not None:
+            return self.query_cache.embed_query(query)
+        return self.embedding_provider.embed([query])[0]
+
+
+def _cosine_similarities(query_vector: np.ndarray, doc_matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(doc_matrix, axis=1) * np.linalg.norm(query_vector)
+    dots = doc_matrix @ query_vector
+    return np.divide(dots, norms, out=np.zeros_like(dots), where=norms != 0)
 
 
 def take_top_n(candidates: Iterable[SearchResult], top_n: int) -> List[SearchResult]:
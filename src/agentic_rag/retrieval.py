@@ -7,12 +7,14 @@ from typing import Dict, List, Optional, Sequence
 import json
 
 from .config import AzureSearchSettings
-from .embeddings import EmbeddingProvider
+from .embeddings import EmbeddingProvider, QueryEmbeddingCache, truncate_embeddings
+from .http_client import HTTPClientFactory, build_client
+from .models import intern_optional, shared_groups
 
 
 @dataclass(slots=True)
 class SearchResult:
-    """Normalized shape for retrieved documents."""
+    """Normalized shape for retrieved documents; shares strings and ACLs like ``Chunk``."""
 
     chunk_id: str
     doc_id: str
@@ -27,9 +29,22 @@ class SearchResult:
     metadata: Dict[str, object]
     highlights: Optional[str] = None
 
+    def __post_init__(self) -> None:
+        # Search responses may carry nulls, so every field tolerates None.
+        self.doc_id = intern_optional(self.doc_id)
+        self.rev = intern_optional(self.rev)
+        self.source_url = intern_optional(self.source_url)
+        self.section_path = intern_optional(self.section_path)
+        self.allowed_groups = shared_groups(self.allowed_groups or ())
+
 
 class AzureSearchRetriever:
-    """Executes hybrid queries (BM25 + vector) with ACL filters."""
+    """Executes hybrid queries (BM25 + vector) with ACL filters.
+
+    ``dimensions`` must match the indexer's so query and document vectors
+    are truncated the same way. Pass ``http`` to share connection pools with
+    the other adapters.
+    """
 
     def __init__(
         self,
@@ -39,12 +54,14 @@ class AzureSearchRetriever:
         select_fields: Optional[Sequence[str]] = None,
         semantic_configuration: Optional[str] = None,
         vector_field: str = "embedding_vector",
+        query_cache: Optional[QueryEmbeddingCache] = None,
+        dimensions: Optional[int] = None,
+        http: Optional[HTTPClientFactory] = None,
     ) -> None:
-        import httpx
-
         self.settings = settings
-        self._client = httpx.Client(
-            base_url=settings.endpoint.rstrip("/"),
+        self._client = build_client(
+            http,
+            settings.endpoint.rstrip("/"),
             headers={
                 "Content-Type": "application/json",
                 "api-key": settings.api_key,
@@ -52,6 +69,7 @@ class AzureSearchRetriever:
             timeout=30,
         )
         self._embedder = embedding_provider
+        self._query_cache = query_cache
         self._select_fields = select_fields or [
             "id",
             "doc_id",
@@ -66,6 +84,7 @@ class AzureSearchRetriever:
         ]
         self._semantic_configuration = semantic_configuration
         self._vector_field = vector_field
+        self._dimensions = dimensions
 
     def _filter_for_groups(self, user_groups: Sequence[str]) -> Optional[str]:
         if not user_groups:
@@ -80,7 +99,11 @@ class AzureSearchRetriever:
         *,
         top_k: int,
     ) -> List[SearchResult]:
-        vector = self._embedder.embed([query])[0]
+        if self._query_cache is not None:
+            vector = self._query_cache.embed_query(query)
+        else:
+            vector = self._embedder.embed([query])[0]
+        vector = truncate_embeddings(vector, self._dimensions)
         body: Dict[str, object] = {
             "search": query,
             "top": top_k,
@@ -88,7 +111,7 @@ class AzureSearchRetriever:
             "includeTotalResultCount": False,
             "vectors": [
                 {
-                    "value": vector,
+                    "value": vector.tolist(),
                     "fields": self._vector_field,
                     "k": top_k,
                 }
@@ -0,0 +1,159 @@
+"""Token counting strategies used to size chunks against embedding limits."""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimator (word count * 1.3)."""
+
+    words = len(text.split())
+    return max(1, int(words * 1.3))
+
+
+class Tokenizer(ABC):
+    """Counts tokens the way the embedding model will see them."""
+
+    @abstractmethod
+    def count_tokens(self, text: str) -> int:
+        raise NotImplementedError
+
+
+class HeuristicTokenizer(Tokenizer):
+    """Default word-count heuristic; needs no model files."""
+
+    def count_tokens(self, text: str) -> int:
+        # Inlined estimate_tokens: this runs once per block on the chunking hot path.
+        return max(1, int(len(text.split()) * 1.3))
+
+
+# GPT-2 style pre-tokenizer expressed with stdlib ``re`` classes: contractions,
+# letter runs, digit runs, other symbols (including ``_``), then whitespace.
+_PRETOKENIZE = re.compile(
+    r"""'s|'t|'re|'ve|'m|'ll|'d| ?[^\W\d_]+| ?\d+| ?(?:[^\s\w]|_)+|\s+(?!\S)|\s+"""
+)
+
+
+def _bytes_to_unicode() -> Dict[int, str]:
+    """Byte-level BPE alphabet: map every byte to a printable code point."""
+
+    printable = (
+        list(range(ord("!"), ord("~") + 1))
+        + list(range(ord("¡"), ord("¬") + 1))
+        + list(range(ord("®"), ord("ÿ") + 1))
+    )
+    codes = printable[:]
+    extra = 0
+    for byte in range(256):
+        if byte not in printable:
+            printable.append(byte)
+            codes.append(256 + extra)
+            extra += 1
+    return dict(zip(printable, (chr(code) for code in codes)))
+
+
+class BPETokenizer(Tokenizer):
+    """Byte-level BPE counter driven by a local ``vocab.json`` + ``merges.txt`` pair."""
+
+    def __init__(self, vocab: Dict[str, int], merges: List[Tuple[str, str]], piece_cache_size: int = 50_000) -> None:
+        self.vocab = vocab
+        self.ranks = {pair: rank for rank, pair in enumerate(merges)}
+        self._byte_encoder = _bytes_to_unicode()
+        self._piece_cache: Dict[str, int] = {}
+        self._piece_cache_size = piece_cache_size
+
+    @classmethod
+    def from_files(cls, vocab_path: Path, merges_path: Path) -> "BPETokenizer":
+        vocab = json.loads(vocab_path.read_text(encoding="utf-8"))
+        merges: List[Tuple[str, str]] = []
+        for line in merges_path.read_text(encoding="utf-8").splitlines():
+            if not line or line.startswith("#version"):
+                continue
+            left, _, right = line.partition(" ")
+            merges.append((left, right))
+        return cls(vocab, merges)
+
+    def count_tokens(self, text: str) -> int:
+        total = 0
+        for piece in _PRETOKENIZE.findall(text):
+            total += self._count_piece(piece)
+        return total
+
+    def _count_piece(self, piece: str) -> int:
+        cached = self._piece_cache.get(piece)
+        if cached is not None:
+            return cached
+        symbols = "".join(self._byte_encoder[byte] for byte in piece.encode("utf-8"))
+        count = sum(
+            len(part) if part not in self.vocab else 1 for part in self._merge(symbols)
+        )
+        if len(self._piece_cache) >= self._piece_cache_size:
+            self._piece_cache.clear()
+        self._piece_cache[piece] = count
+        return count
+
+    def _merge(self, symbols: str) -> List[str]:
+        parts = list(symbols)
+        while len(parts) > 1:
+            best_rank = None
+            best_index = -1
+            for index in range(len(parts) - 1):
+                rank = self.ranks.get((parts[index], parts[index + 1]))
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best_rank = rank
+                    best_index = index
+            if best_rank is None:
+                break
+            parts[best_index : best_index + 2] = [parts[best_index] + parts[best_index + 1]]
+        return parts
+
+
+class CachedTokenizer(Tokenizer):
+    """LRU cache of token counts keyed by a hash of the text.
+
+    Repeated blocks (boilerplate, unchanged sections across revisions) are
+    counted once per process instead of once per occurrence.
+    """
+
+    def __init__(self, tokenizer: Tokenizer, maxsize: int = 65_536) -> None:
+        self.tokenizer = tokenizer
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._counts: "OrderedDict[bytes, int]" = OrderedDict()
+
+    def count_tokens(self, text: str) -> int:
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        count = self._counts.get(key)
+        if count is not None:
+            self.hits += 1
+            self._counts.move_to_end(key)
+            return count
+        self.misses += 1
+        count = self.tokenizer.count_tokens(text)
+        self._counts[key] = count
+        if len(self._counts) > self.maxsize:
+            self._counts.popitem(last=False)
+        return count
+
+
+def load_bpe_tokenizer(vocab_path: Path, merges_path: Path, cache_size: int = 65_536) -> Tokenizer:
+    """Load a local BPE vocabulary and wrap it with the token-count cache."""
+
+    return CachedTokenizer(BPETokenizer.from_files(vocab_path, merges_path), maxsize=cache_size)
+
+
+__all__ = [
+    "Tokenizer",
+    "HeuristicTokenizer",
+    "BPETokenizer",
+    "CachedTokenizer",
+    "estimate_tokens",
+    "load_bpe_tokenizer",
+]
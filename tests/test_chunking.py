@@ -0,0 +1,44 @@
+from agentic_rag.chunking import ChunkingConfig, chunk_document
+from agentic_rag.models import DocumentBlock, DocumentRevision
+
+
+def _revision(blocks):
+    return DocumentRevision(
+        doc_id="DOC-1",
+        rev="A",
+        title="Widget spec",
+        effective_date=None,
+        allowed_groups=["eng"],
+        source_url="https://example.com/doc-1",
+        blocks=blocks,
+    )
+
+
+def _sentences(count, start=0):
+    return " ".join(f"Step {i} tightens fastener {i} on the widget frame." for i in range(start, start + count))
+
+
+def test_oversized_blocks_are_not_emitted_twice():
+    config = ChunkingConfig()
+    blocks = [DocumentBlock(page=1, kind="paragraph", text=f"Scope paragraph {i}.") for i in range(3)]
+    blocks.append(DocumentBlock(page=2, kind="paragraph", text=_sentences(100)))
+    blocks.append(DocumentBlock(page=3, kind="paragraph", text=_sentences(60, start=100)))
+
+    chunks = chunk_document(_revision(blocks), config)
+
+    texts = [chunk.text for chunk in chunks]
+    assert len(texts) == len(set(texts))
+    assert all(chunk.token_count <= config.max_tokens for chunk in chunks)
+
+
+def test_block_of_exactly_max_tokens_is_emitted_once():
+    config = ChunkingConfig()
+    count_tokens = config.tokenizer.count_tokens
+    words = []
+    while count_tokens(" ".join(words + [f"w{len(words)}"])) <= config.max_tokens:
+        words.append(f"w{len(words)}")
+    block = DocumentBlock(page=1, kind="paragraph", text=" ".join(words))
+
+    chunks = chunk_document(_revision([block]), config)
+
+    assert [chunk.text for chunk in chunks] == [block.text]
@@ -0,0 +1,32 @@
+import io
+import json
+
+import pytest
+
+from agentic_rag.loading import _JSONReader
+
+PAYLOAD = {
+    "doc_id": "DOC-1",
+    "a": [1.5, 2.25e-3, -7, 0, 10, -0.125, 6.02e23, 1e-07],
+    "limits": {"torque": 12.75, "angle": -90, "ratio": 3e2},
+    "weight": 1234.5,
+    "flags": [True, False, None],
+    "blocks": [{"page": 1, "kind": "paragraph", "text": "Torque to 12.5 Nm."}],
+}
+
+
+def _read(reader: _JSONReader):
+    char = reader.peek()
+    if char == "{":
+        return {key: _read(reader) for key in reader.members()}
+    if char == "[":
+        return list(reader.items())
+    return reader.value()
+
+
+@pytest.mark.parametrize("read_size", range(1, 48))
+def test_reader_decodes_numbers_split_across_reads(read_size):
+    for text in (json.dumps(PAYLOAD), json.dumps(PAYLOAD, separators=(",", ":"))):
+        reader = _JSONReader(io.StringIO(text), read_size=read_size)
+
+        assert _read(reader) == PAYLOAD